@@ -7,6 +7,7 @@ from typing import Any
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
+from aiogram.fsm.storage.base import BaseStorage
 from aiogram.fsm.storage.memory import MemoryStorage
 from aiogram.types import BotCommand, ErrorEvent
 
@@ -16,14 +17,25 @@ from app.i18n import T
 from app.logger import logger
 
 from .handlers import router
+from .middlewares import RateLimitMiddleware
+from .notifications import start_notify_worker, stop_notify_worker
 
 settings = get_settings()
 
 def create_bot() -> Bot:
-    return Bot(
+    bot = Bot(
         token=settings.TELEGRAM_TOKEN,
         default=DefaultBotProperties(parse_mode=ParseMode.HTML),
     )
+    # Every outgoing call goes through the session, so throttling there covers
+    # handlers and background notifications alike.
+    bot.session.middleware(
+        RateLimitMiddleware(
+            global_rate=settings.BOT_GLOBAL_RATE_LIMIT,
+            chat_rate=settings.BOT_CHAT_RATE_LIMIT,
+        )
+    )
+    return bot
 
 
 async def error_handler(event: ErrorEvent) -> Any:
@@ -36,8 +48,25 @@ async def error_handler(event: ErrorEvent) -> Any:
     )
 
 
+def create_storage() -> BaseStorage:
+    """Return Redis-backed FSM storage when configured, else in-memory storage.
+
+    Redis lets several bot processes share conversation state and expires
+    abandoned flows; ``MemoryStorage`` is kept for single-process local runs.
+    """
+    if settings.REDIS_URL:
+        from aiogram.fsm.storage.redis import RedisStorage
+
+        return RedisStorage.from_url(
+            settings.REDIS_URL,
+            state_ttl=settings.FSM_STATE_TTL,
+            data_ttl=settings.FSM_STATE_TTL,
+        )
+    return MemoryStorage()
+
+
 def create_dispatcher() -> Dispatcher:
-    dispatcher = Dispatcher(storage=MemoryStorage())
+    dispatcher = Dispatcher(storage=create_storage())
     dispatcher.include_router(router)
     
     # Register global error handler
@@ -56,12 +85,31 @@ async def setup_bot_commands(bot: Bot) -> None:
     await bot.set_my_commands(commands)
 
 
-async def on_startup(bot: Bot) -> None:
+async def setup_update_delivery(bot: Bot, dispatcher: Dispatcher) -> None:
+    """Register or remove the Telegram webhook to match the configured mode.
+
+    Only update types the routers handle are requested from Telegram.
+    """
+    if settings.POLLING:
+        await bot.delete_webhook()
+    elif settings.WEBHOOK_URL:
+        await bot.set_webhook(
+            settings.WEBHOOK_URL.rstrip("/") + settings.WEBHOOK_PATH,
+            allowed_updates=dispatcher.resolve_used_update_types(),
+            drop_pending_updates=True,
+            secret_token=settings.WEBHOOK_SECRET,
+        )
+
+
+async def on_startup(bot: Bot, dispatcher: Dispatcher) -> None:
     logging.getLogger(__name__).info("Bot startup complete")
     await setup_bot_commands(bot)
+    await setup_update_delivery(bot, dispatcher)
+    start_notify_worker(bot)
 
 
 async def on_shutdown(bot: Bot) -> None:
     logging.getLogger(__name__).info("Shutting down bot and disposing engine")
+    await stop_notify_worker()
     await bot.session.close()
     await dispose_engine()
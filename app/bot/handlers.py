@@ -1,71 +1,164 @@
 """Aiogram router with command and callback handlers."""
 from __future__ import annotations
 
+import asyncio
 import logging
+import re
 from decimal import Decimal, InvalidOperation
-from functools import wraps
 from typing import Iterable, Callable, Any
 from app.i18n import T
 
 from aiogram import F, Router
 from aiogram.exceptions import TelegramBadRequest
-from aiogram.filters import Command, CommandStart
+from aiogram.filters import Command, CommandStart, StateFilter
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.types import CallbackQuery, InlineKeyboardMarkup, Message, ReplyKeyboardRemove
+from cachetools import LRUCache
 
 from app.config import get_settings
 from app.db.session import session_scope
-from app.db.models import Book, BookCondition
+from app.db.models import Book, BookCondition, User, price_to_cents
 from app.logger import logger
 
 
+from .middlewares import ErrorsMiddleware, ThrottlingMiddleware
 from .keyboards import (
     BrowseCallback,
     ConfirmCallback,
     MainMenuCallback,
     ManageBookCallback,
+    MyListingsCallback,
     SearchCallback,
     browse_keyboard,
     condition_keyboard,
     confirm_keyboard,
     inline_main_menu_keyboard,
-    main_menu_keyboard,
     manage_books_keyboard,
     search_results_keyboard,
 )
 from .utils import (
     buyer_contact_repr,
     condition_label,
-    ensure_user,
+    create_book,
+    format_book_row,
     format_book_summary,
+    format_price,
     get_book_by_id,
-    get_user_books,
     notify_seller_of_interest,
-    paginate_books,
+    paginate_books_lite,
+    paginate_user_books,
+    resolve_user_id,
     search_books,
+    user_from_telegram,
 )
 
-router = Router()
 settings = get_settings()
 
+router = Router()
+if settings.BOT_THROTTLE_SECONDS > 0:
+    router.message.outer_middleware(ThrottlingMiddleware(rate=settings.BOT_THROTTLE_SECONDS))
+router.message.middleware(ErrorsMiddleware())
+router.callback_query.middleware(ErrorsMiddleware())
+
+# Static texts and templates are translated once at import.
+_WELCOME_TEXT = T(
+    "👋 Welcome to the Book Swap Marketplace!\n\n"
+    "• Post textbooks you want to sell\n"
+    "• Browse available books from other students\n"
+    "• Manage your active listings\n\n"
+    "Choose an option from the menu below:"
+)
+_HELP_TEXT = T(
+    "Here are the main commands:\n"
+    "/start – show welcome menu\n"
+    "/post – start listing flow\n"
+    "/browse – browse available books\n"
+    "/search – search for specific books\n"
+    "/mybooks – manage your listings"
+)
+_NOTHING_TO_CANCEL = T("❌ You're not in any process to cancel.")
+_CANCELED = T("✅ Canceled! Back to the main menu.")
+_ASK_TITLE = T("Let's list a book! What is the title?")
+_TITLE_REQUIRED = T("Please provide a title.")
+_ASK_AUTHOR = T("Who's the author? Send 'skip' if unknown.")
+_ASK_CONDITION = T("Select the condition:")
+_INVALID_CONDITION = T("Please choose a condition from the keyboard options.")
+_ASK_PRICE = T("What price are you asking? Use numbers only (e.g., 12.50).")
+_INVALID_PRICE = T("Please send a valid non-negative price (e.g., 15.00).")
+_ASK_DESCRIPTION = T("Add an optional description or send 'skip'.")
+_UNKNOWN = T("Unknown")
+_LISTING_CANCELLED = T("Listing cancelled.")
+_INVALID_PRICE_DATA = T("Invalid price data.")
+_BOOK_LISTED_TMPL = T("✅ Book listed! (ID #{book_id})")
+_LISTING_PUBLISHED = T("Listing published!")
+_LISTED_NEXT_STEP_TEXT = T(
+    "🎉 Your book has been successfully listed!\n\n"
+    "What would you like to do next?"
+)
+_SEARCH_PROMPT = T(
+    "🔎 <b>Search Books</b>\n\n"
+    "Enter keywords to search for books by:\n"
+    "• Title\n"
+    "• Author\n"
+    "• Description\n\n"
+    "Type your search term:"
+)
+_NO_LISTINGS_WITH_MENU = T(
+    "You have no active listings right now.\n\n"
+    "Use the menu below to post your first book!"
+)
+_NO_BOOKS_AVAILABLE = T("No books are available yet. Try again soon!")
+_MISSING_BOOK = T("Missing book information.")
+_LISTING_UNAVAILABLE = T("This listing is no longer available.")
+_UNAVAILABLE = T("Unavailable")
+_SELLER_CONTACT_TMPL = T(
+    "Seller contact for '{title}': {contact}\n"
+    "Mention that you're from the Book Swap Marketplace."
+)
+_CONTACT_SENT = T("Contact sent! 👌")
+_NO_LISTINGS = T("You have no active listings right now.")
+_MY_LISTINGS_HEADER = T("📚 Your active listings:")
+_SEARCH_TERM_REQUIRED = T("Please enter a search term.")
+_NO_SEARCH_RESULTS_TMPL = T(
+    "🔍 No books found for '<b>{query}</b>'\n\n"
+    "Try different keywords or browse all books instead."
+)
+_NO_SEARCH_RESULTS_PLAIN_TMPL = T("No books found for '{query}'")
+_SEARCH_EXPIRED = T("Search query not found. Please start a new search.")
+_SELLER_CONTACT_HTML_TMPL = T(
+    "Seller contact for '<b>{title}</b>': {contact}\n"
+    "Mention that you're from the Book Swap Marketplace."
+)
+_CANNOT_MODIFY = T("You cannot modify this listing.")
+_ALREADY_SOLD = T("Already marked as sold.")
+_MARKED_SOLD = T("Marked as sold.")
+_MARKED_SOLD_TEXT = T("Listing marked as sold. Refresh /mybooks to see remaining items.")
+_BROWSE_HEADER_TMPL = T("📚 Page {page}/{total_pages}")
+_SEARCH_HEADER_TMPL = T("🔍 Search results for '<b>{query}</b>' - Page {page}/{total_pages}")
+_SUMMARY_TMPL = T("Please confirm your listing:\n\nTitle: {title}\nAuthor: {author}\nCondition: {condition}\nPrice: {price}\nDescription: {description}")
+
+# (chat_id, message_id) -> hash of the page text last rendered into that message.
+_RENDERED_PAGES: LRUCache[tuple[int, int], int] = LRUCache(maxsize=10_000)
+
 POST_COMMANDS = {"/post", "post a book", "list a book"}
 BROWSE_COMMANDS = {"/browse", "browse", "browse books"}
 SEARCH_COMMANDS = {"/search", "search", "search books"}
 MY_LISTINGS_COMMANDS = {"/mybooks", "my books", "my listings"}
 
+# Up to eight whole digits and two decimals: at most 9,999,999,999 cents,
+# well inside the BIGINT price_cents column.
+_PRICE_RE = re.compile(r"\d{1,8}(?:\.\d{1,2})?")
+
 
-def log_errors(func: Callable) -> Callable:
-    """Decorator to log errors in handler functions."""
-    @wraps(func)
-    async def wrapper(*args, **kwargs):
-        try:
-            return await func(*args, **kwargs)
-        except Exception as e:
-            logger.error(f"Error in handler {func.__name__}: {e}", exc_info=True)
-            # Re-raise so aiogram's error handler can also process it
-            raise
-    return wrapper
+async def _load_book(book_id: int) -> Book | None:
+    """Fetch a book in its own session.
+
+    An ``AsyncSession`` cannot run statements concurrently, so a lookup awaited
+    together with other queries via ``asyncio.gather`` gets a dedicated session.
+    """
+    async with session_scope() as session:
+        return await get_book_by_id(session, book_id)
 
 
 class PostBookStates(StatesGroup):
@@ -82,55 +175,53 @@ class SearchStates(StatesGroup):
 
 
 CONDITION_MAP = {condition_label(c).casefold(): c for c in BookCondition}
+_CONDITION_KEYS: frozenset[str] = frozenset(CONDITION_MAP)
 
 
 @router.message(CommandStart())
 async def handle_start(message: Message, state: FSMContext) -> None:
     await state.clear()
-    async with session_scope() as session:
-        await ensure_user(session, message.from_user)
-    welcome = T(
-        "👋 Welcome to the Book Swap Marketplace!\n\n"
-        "• Post textbooks you want to sell\n"
-        "• Browse available books from other students\n"
-        "• Manage your active listings\n\n"
-        "Choose an option from the menu below:"
-    )
-    await message.answer(welcome, reply_markup=inline_main_menu_keyboard())
+    await resolve_user_id(message.from_user)
+    await message.answer(_WELCOME_TEXT, reply_markup=inline_main_menu_keyboard())
 
 
 @router.message(Command("help"))
 async def handle_help(message: Message) -> None:
-    help_text = T(
-        "Here are the main commands:\n"
-        "/start – show welcome menu\n"
-        "/post – start listing flow\n"
-        "/browse – browse available books\n"
-        "/search – search for specific books\n"
-        "/mybooks – manage your listings"
-    )
-    await message.answer(help_text)
+    await message.answer(_HELP_TEXT)
 
 
 @router.message(Command("cancel"))
 async def handle_cancel(message: Message, state: FSMContext) -> None:
     current_state = await state.get_state()
     if current_state is None:
-        await message.answer(T("❌ You're not in any process to cancel."))
+        await message.answer(_NOTHING_TO_CANCEL)
     else:
         await state.clear()
-        await message.answer(T("✅ Canceled! Back to the main menu."), reply_markup=inline_main_menu_keyboard())
+        await message.answer(_CANCELED, reply_markup=inline_main_menu_keyboard())
+
+
+def _match_text_command(message: Message) -> dict[str, Any] | bool:
+    """Resolve a plain-text menu command with one casefold and dict lookup."""
+    if not message.text:
+        return False
+    handler = _TEXT_COMMAND_ROUTES.get(message.text.casefold())
+    return {"text_command": handler} if handler else False
+
+
+# Only outside a flow: while a listing or search waits for input, "browse" or
+# "my books" is that input (a title, a query), not a menu command.
+@router.message(StateFilter(None), _match_text_command)
+async def dispatch_text_command(message: Message, state: FSMContext, text_command: Callable) -> None:
+    await text_command(message, state)
 
 
 @router.message(Command("post"))
-@router.message(F.text.casefold().in_(POST_COMMANDS))
 async def start_post_flow(message: Message, state: FSMContext) -> None:
     await state.clear()
-    async with session_scope() as session:
-        await ensure_user(session, message.from_user)
+    await state.update_data(seller_id=await resolve_user_id(message.from_user))
     await state.set_state(PostBookStates.title)
     await message.answer(
-        T("Let's list a book! What is the title?"),
+        _ASK_TITLE,
         reply_markup=ReplyKeyboardRemove(),
     )
 
@@ -139,11 +230,11 @@ async def start_post_flow(message: Message, state: FSMContext) -> None:
 async def collect_title(message: Message, state: FSMContext) -> None:
     text = (message.text or "").strip()
     if not text:
-        await message.answer(T("Please provide a title."))
+        await message.answer(_TITLE_REQUIRED)
         return
     await state.update_data(title=text)
     await state.set_state(PostBookStates.author)
-    await message.answer(T("Who's the author? Send 'skip' if unknown."))
+    await message.answer(_ASK_AUTHOR)
 
 
 @router.message(PostBookStates.author)
@@ -152,19 +243,20 @@ async def collect_author(message: Message, state: FSMContext) -> None:
     author = None if text.lower() == "skip" else text
     await state.update_data(author=author)
     await state.set_state(PostBookStates.condition)
-    await message.answer(T("Select the condition:"), reply_markup=condition_keyboard())
+    await message.answer(_ASK_CONDITION, reply_markup=condition_keyboard())
 
 
 @router.message(PostBookStates.condition)
 async def collect_condition(message: Message, state: FSMContext) -> None:
-    text = (message.text or "").strip().casefold()
-    if text not in CONDITION_MAP:
-        await message.answer(T("Please choose a condition from the keyboard options."))
+    raw = message.text
+    text = raw.strip().casefold() if raw else ""
+    if text not in _CONDITION_KEYS:
+        await message.answer(_INVALID_CONDITION)
         return
     await state.update_data(condition=CONDITION_MAP[text].value)
     await state.set_state(PostBookStates.price)
     await message.answer(
-        T("What price are you asking? Use numbers only (e.g., 12.50)."),
+        _ASK_PRICE,
         reply_markup=ReplyKeyboardRemove(),
     )
 
@@ -172,16 +264,13 @@ async def collect_condition(message: Message, state: FSMContext) -> None:
 @router.message(PostBookStates.price)
 async def collect_price(message: Message, state: FSMContext) -> None:
     text = (message.text or "").strip()
-    try:
-        price = Decimal(text)
-        if price < 0:
-            raise InvalidOperation
-    except (InvalidOperation, ValueError):
-        await message.answer(T("Please send a valid non-negative price (e.g., 15.00)."))
+    # Checked up front so Decimal() never sees exponents, NaN or huge input.
+    if _PRICE_RE.fullmatch(text) is None:
+        await message.answer(_INVALID_PRICE)
         return
-    await state.update_data(price=str(price))
+    await state.update_data(price=str(Decimal(text)))
     await state.set_state(PostBookStates.description)
-    await message.answer(T("Add an optional description or send 'skip'."))
+    await message.answer(_ASK_DESCRIPTION)
 
 
 @router.message(PostBookStates.description)
@@ -197,57 +286,52 @@ async def collect_description(message: Message, state: FSMContext) -> None:
 
 def build_summary_preview(data: dict) -> str:
     condition = condition_label(BookCondition(data["condition"]))
-    template = T("Please confirm your listing:\n\nTitle: {title}\nAuthor: {author}\nCondition: {condition}\nPrice: {price}\nDescription: {description}")
-    return template.format(
+    return _SUMMARY_TMPL.format(
         title=data['title'],
-        author=data.get('author') or T('Unknown'),
+        author=data.get('author') or _UNKNOWN,
         condition=condition,
-        price=data['price'],
+        price=format_price(data['price']),
         description=data.get('description') or '—'
     )
 
 
 @router.callback_query(ConfirmCallback.filter())
 async def finish_post_flow(query: CallbackQuery, callback_data: ConfirmCallback, state: FSMContext) -> None:
-    if callback_data.action == "cancel":
+    if callback_data.action == "x":
         await state.clear()
-        await query.message.edit_text(T("Listing cancelled."))
+        await query.message.edit_text(_LISTING_CANCELLED)
         await query.answer()
         return
 
     data = await state.get_data()
     try:
-        price = Decimal(data["price"])
-    except (KeyError, InvalidOperation):
-        await query.answer(T("Invalid price data."), show_alert=True)
+        price_cents = price_to_cents(data["price"])
+    except (KeyError, InvalidOperation, ValueError):
+        await query.answer(_INVALID_PRICE_DATA, show_alert=True)
         return
 
+    # Resolved when the flow started; flows begun before it was stored in the
+    # state fall back to a lookup.
+    seller_id = data.get("seller_id") or await resolve_user_id(query.from_user)
     async with session_scope() as session:
-        seller = await ensure_user(session, query.from_user)
-        book = Book(
+        book_id = await create_book(
+            session,
+            seller_id=seller_id,
             title=data["title"],
             author=data.get("author"),
-            price=price,
+            price_cents=price_cents,
             condition=BookCondition(data["condition"]),
             description=data.get("description"),
-            seller_id=seller.id,
         )
-        session.add(book)
-        await session.flush()
-        book_id = book.id
 
     await state.clear()
     await query.message.edit_text(
-        T("✅ Book listed! (ID #{book_id})").format(book_id=book_id), reply_markup=None
+        _BOOK_LISTED_TMPL.format(book_id=book_id), reply_markup=None
     )
-    await query.answer(T("Listing published!"))
+    await query.answer(_LISTING_PUBLISHED)
     
     # Send main menu after successful book posting
-    menu_text = T(
-        "🎉 Your book has been successfully listed!\n\n"
-        "What would you like to do next?"
-    )
-    await query.message.answer(menu_text, reply_markup=inline_main_menu_keyboard())
+    await query.message.answer(_LISTED_NEXT_STEP_TEXT, reply_markup=inline_main_menu_keyboard())
 
 
 @router.callback_query(MainMenuCallback.filter())
@@ -255,160 +339,210 @@ async def handle_main_menu(query: CallbackQuery, callback_data: MainMenuCallback
     """Handle inline main menu button presses."""
     await query.answer()
     
-    if callback_data.action == "post":
+    if callback_data.action == "p":
         await state.clear()
-        async with session_scope() as session:
-            await ensure_user(session, query.from_user)
+        await state.update_data(seller_id=await resolve_user_id(query.from_user))
         await state.set_state(PostBookStates.title)
         await query.message.answer(
-            T("Let's list a book! What is the title?"),
+            _ASK_TITLE,
             reply_markup=ReplyKeyboardRemove(),
         )
         
-    elif callback_data.action == "browse":
+    elif callback_data.action == "b":
         text, buttons, _, total_pages = await render_browse_page(page=1)
         markup = browse_keyboard(books=buttons, page=1, total_pages=total_pages) if buttons else None
         await query.message.answer(text, reply_markup=markup, disable_web_page_preview=True)
         
-    elif callback_data.action == "search":
+    elif callback_data.action == "s":
         await state.clear()
         await state.set_state(SearchStates.query)
         await query.message.answer(
-            T("🔎 <b>Search Books</b>\n\n"
-            "Enter keywords to search for books by:\n"
-            "• Title\n"
-            "• Author\n"
-            "• Description\n\n"
-            "Type your search term:"),
+            _SEARCH_PROMPT,
             parse_mode="HTML",
             reply_markup=ReplyKeyboardRemove(),
         )
         
-    elif callback_data.action == "mybooks":
-        async with session_scope() as session:
-            user = await ensure_user(session, query.from_user)
-            books = await get_user_books(session, seller_id=user.id, include_sold=False)
+    elif callback_data.action == "l":
+        user_id = await resolve_user_id(query.from_user)
+        text, markup, total = await render_my_listings_page(user_id, user_from_telegram(query.from_user), page=1)
 
-        if not books:
+        if not total:
             await query.message.answer(
-                T("You have no active listings right now.\n\n"
-                "Use the menu below to post your first book!"),
+                _NO_LISTINGS_WITH_MENU,
                 reply_markup=inline_main_menu_keyboard()
             )
             return
 
-        text, markup = build_my_listings_view(books)
         await query.message.answer(text, reply_markup=markup, disable_web_page_preview=True)
 
 
-async def render_browse_page(page: int) -> tuple[str, list[tuple[int, str]], int, int]:
+async def show_page(
+    query: CallbackQuery,
+    text: str,
+    markup: InlineKeyboardMarkup | None,
+    **kwargs: Any,
+) -> None:
+    """Show a results page by editing the message the button belongs to.
+
+    Edits that would not change the text (double taps, stale buttons) are
+    skipped instead of costing a Telegram call. If the message can no longer
+    be edited, the page is sent as a new message.
+    """
+    key = (query.message.chat.id, query.message.message_id)
+    digest = hash(text)
+    if _RENDERED_PAGES.get(key) == digest:
+        return
+    try:
+        await query.message.edit_text(text, reply_markup=markup, disable_web_page_preview=True, **kwargs)
+    except TelegramBadRequest as e:
+        if "message is not modified" not in e.message:
+            # The page now lives in a new message; the old one keeps whatever
+            # it showed before, so forget what we had recorded for it.
+            _RENDERED_PAGES.pop(key, None)
+            sent = await query.message.answer(text, reply_markup=markup, disable_web_page_preview=True, **kwargs)
+            _RENDERED_PAGES[(sent.chat.id, sent.message_id)] = digest
+            return
+    _RENDERED_PAGES[key] = digest
+
+
+async def render_browse_page(
+    page: int,
+    *,
+    after_id: int | None = None,
+    before_id: int | None = None,
+) -> tuple[str, list[tuple[int, str]], int, int]:
     async with session_scope() as session:
-        books, total, total_pages = await paginate_books(
-            session, page=page, per_page=settings.PAGE_SIZE
+        rows, total, total_pages = await paginate_books_lite(
+            session,
+            page=page,
+            per_page=settings.PAGE_SIZE,
+            after_id=after_id,
+            before_id=before_id,
         )
     if total == 0:
-        return (T("No books are available yet. Try again soon!"), [], page, 1)
+        return (_NO_BOOKS_AVAILABLE, [], page, 1)
 
-    lines = [T("📚 Page {page}/{total_pages}").format(page=page, total_pages=total_pages)]
-    for idx, book in enumerate(books, start=1):
-        lines.append(f"\n#{idx}\n{format_book_summary(book)}")
+    lines = [_BROWSE_HEADER_TMPL.format(page=page, total_pages=total_pages)]
+    for idx, row in enumerate(rows, start=1):
+        lines.append(f"\n#{idx}\n{format_book_row(row)}")
     text = "\n".join(lines)
-    buttons = [(book.id, book.title) for book in books]
+    buttons = [(row["id"], row["title"]) for row in rows]
     return text, buttons, total, total_pages
 
 
 @router.message(Command("browse"))
-@router.message(F.text.casefold().in_(BROWSE_COMMANDS))
-async def browse_books(message: Message) -> None:
+async def browse_books(message: Message, state: FSMContext) -> None:
     text, buttons, _, total_pages = await render_browse_page(page=1)
     markup = browse_keyboard(books=buttons, page=1, total_pages=total_pages) if buttons else None
     await message.answer(text, reply_markup=markup, disable_web_page_preview=True)
 
 
 @router.message(Command("search"))
-@router.message(F.text.casefold().in_(SEARCH_COMMANDS))
 async def start_search(message: Message, state: FSMContext) -> None:
     await state.clear()
     await state.set_state(SearchStates.query)
     await message.answer(
-        T("🔎 <b>Search Books</b>\n\n"
-        "Enter keywords to search for books by:\n"
-        "• Title\n"
-        "• Author\n"
-        "• Description\n\n"
-        "Type your search term:"),
+        _SEARCH_PROMPT,
         parse_mode="HTML",
         reply_markup=ReplyKeyboardRemove(),
     )
 
 
-@router.callback_query(BrowseCallback.filter(F.action == "page"))
+@router.callback_query(BrowseCallback.filter(F.action == "p"))
 async def paginate_browse(query: CallbackQuery, callback_data: BrowseCallback) -> None:
     page = max(1, callback_data.page)
-    text, buttons, _, total_pages = await render_browse_page(page=page)
+    text, buttons, _, total_pages = await render_browse_page(
+        page=page,
+        after_id=callback_data.after_id,
+        before_id=callback_data.before_id,
+    )
     markup = browse_keyboard(books=buttons, page=page, total_pages=total_pages) if buttons else None
-    try:
-        await query.message.edit_text(text, reply_markup=markup, disable_web_page_preview=True)
-    except TelegramBadRequest:
-        await query.message.answer(text, reply_markup=markup, disable_web_page_preview=True)
+    await show_page(query, text, markup)
     await query.answer()
 
 
-@router.callback_query(BrowseCallback.filter(F.action == "contact"))
+@router.callback_query(BrowseCallback.filter(F.action == "c"))
 async def contact_seller(query: CallbackQuery, callback_data: BrowseCallback) -> None:
     book_id = callback_data.book_id
     if not book_id:
-        await query.answer(T("Missing book information."), show_alert=True)
+        await query.answer(_MISSING_BOOK, show_alert=True)
         return
 
-    async with session_scope() as session:
-        book = await get_book_by_id(session, book_id)
-        buyer = await ensure_user(session, query.from_user)
+    book, _ = await asyncio.gather(_load_book(book_id), resolve_user_id(query.from_user))
 
     if book is None or book.is_sold:
-        await query.answer(T("This listing is no longer available."), show_alert=True)
+        await query.answer(_LISTING_UNAVAILABLE, show_alert=True)
         return
 
-    seller_contact = book.seller.public_display() if book.seller else T("Unavailable")
+    seller_contact = book.seller.public_display() if book.seller else _UNAVAILABLE
     buyer_contact = buyer_contact_repr(query.from_user)
 
-    message = T(
-        "Seller contact for '{title}': {contact}\n"
-        "Mention that you're from the Book Swap Marketplace."
-    ).format(title=book.title, contact=seller_contact)
+    message = _SELLER_CONTACT_TMPL.format(title=book.title, contact=seller_contact)
     await query.message.answer(message)
 
     await notify_seller_of_interest(
-        query.bot,
         book=book,
-        buyer=buyer,
         buyer_contact=buyer_contact,
     )
-    await query.answer(T("Contact sent! 👌"))
+    await query.answer(_CONTACT_SENT)
 
 
 @router.message(Command("mybooks"))
-@router.message(F.text.casefold().in_(MY_LISTINGS_COMMANDS))
-async def my_listings(message: Message) -> None:
-    async with session_scope() as session:
-        user = await ensure_user(session, message.from_user)
-        books = await get_user_books(session, seller_id=user.id, include_sold=False)
+async def my_listings(message: Message, state: FSMContext) -> None:
+    user_id = await resolve_user_id(message.from_user)
+    text, markup, total = await render_my_listings_page(user_id, user_from_telegram(message.from_user), page=1)
 
-    if not books:
-        await message.answer(T("You have no active listings right now."))
+    if not total:
+        await message.answer(_NO_LISTINGS)
         return
 
-    text, markup = build_my_listings_view(books)
     await message.answer(text, reply_markup=markup, disable_web_page_preview=True)
 
 
-def build_my_listings_view(books: Iterable[Book]) -> tuple[str, InlineKeyboardMarkup]:
-    lines = [T("📚 Your active listings:")]
+@router.callback_query(MyListingsCallback.filter(F.action == "p"))
+async def paginate_my_listings(query: CallbackQuery, callback_data: MyListingsCallback) -> None:
+    page = max(1, callback_data.page)
+    user_id = await resolve_user_id(query.from_user)
+    text, markup, total = await render_my_listings_page(user_id, user_from_telegram(query.from_user), page=page)
+    if not total:
+        await show_page(query, _NO_LISTINGS, None)
+    else:
+        await show_page(query, text, markup)
+    await query.answer()
+
+
+async def render_my_listings_page(
+    user_id: int,
+    seller: User,
+    page: int,
+) -> tuple[str, InlineKeyboardMarkup, int]:
+    """Render one page of the seller's active listings.
+
+    Returns the text, its keyboard and the seller's total listing count.
+    """
+    async with session_scope() as session:
+        books, total, total_pages = await paginate_user_books(
+            session, seller_id=user_id, page=page, per_page=settings.PAGE_SIZE
+        )
+    text, markup = build_my_listings_view(books, seller, page=page, total_pages=total_pages)
+    return text, markup, total
+
+
+def build_my_listings_view(
+    books: Iterable[Book],
+    seller: User,
+    *,
+    page: int = 1,
+    total_pages: int = 1,
+) -> tuple[str, InlineKeyboardMarkup]:
+    lines = [_MY_LISTINGS_HEADER]
+    if total_pages > 1:
+        lines.append(_BROWSE_HEADER_TMPL.format(page=page, total_pages=total_pages))
     ids = []
     for book in books:
         ids.append(book.id)
-        lines.append(f"\nID #{book.id}\n{format_book_summary(book)}")
-    markup = manage_books_keyboard(ids)
+        lines.append(f"\nID #{book.id}\n{format_book_summary(book, seller)}")
+    markup = manage_books_keyboard(ids, page=page, total_pages=total_pages)
     return "\n".join(lines), markup
 
 
@@ -417,7 +551,7 @@ async def handle_search_query(message: Message, state: FSMContext) -> None:
     """Handle search query input and display results."""
     query = (message.text or "").strip()
     if not query:
-        await message.answer(T("Please enter a search term."))
+        await message.answer(_SEARCH_TERM_REQUIRED)
         return
     
     await state.clear()
@@ -428,8 +562,7 @@ async def handle_search_query(message: Message, state: FSMContext) -> None:
     
     if not buttons:
         await message.answer(
-            T("🔍 No books found for '<b>{query}</b>'\n\n"
-            "Try different keywords or browse all books instead.").format(query=query),
+            _NO_SEARCH_RESULTS_TMPL.format(query=query),
             parse_mode="HTML",
             reply_markup=inline_main_menu_keyboard()
         )
@@ -445,9 +578,9 @@ async def render_search_page(query: str, page: int) -> tuple[str, list[tuple[int
         )
     
     if total == 0:
-        return (T("No books found for '{query}'").format(query=query), [], page, 1)
+        return (_NO_SEARCH_RESULTS_PLAIN_TMPL.format(query=query), [], page, 1)
 
-    lines = [T("🔍 Search results for '<b>{query}</b>' - Page {page}/{total_pages}").format(query=query, page=page, total_pages=total_pages)]
+    lines = [_SEARCH_HEADER_TMPL.format(query=query, page=page, total_pages=total_pages)]
     for idx, book in enumerate(books, start=1):
         lines.append(f"\n#{idx}\n{format_book_summary(book)}")
     
@@ -456,76 +589,77 @@ async def render_search_page(query: str, page: int) -> tuple[str, list[tuple[int
     return text, buttons, total, total_pages
 
 
-@router.callback_query(SearchCallback.filter(F.action == "page"))
+@router.callback_query(SearchCallback.filter(F.action == "p"))
 async def paginate_search_results(query: CallbackQuery, callback_data: SearchCallback, state: FSMContext) -> None:
     """Handle search results pagination."""
     data = await state.get_data()
     search_query = data.get("search_query", "")
     
     if not search_query:
-        await query.answer(T("Search query not found. Please start a new search."), show_alert=True)
+        await query.answer(_SEARCH_EXPIRED, show_alert=True)
         return
     
     page = max(1, callback_data.page)
     text, buttons, _, total_pages = await render_search_page(query=search_query, page=page)
     markup = search_results_keyboard(books=buttons, page=page, total_pages=total_pages, query=search_query) if buttons else None
     
-    try:
-        await query.message.edit_text(text, reply_markup=markup, disable_web_page_preview=True, parse_mode="HTML")
-    except TelegramBadRequest:
-        await query.message.answer(text, reply_markup=markup, disable_web_page_preview=True, parse_mode="HTML")
+    await show_page(query, text, markup, parse_mode="HTML")
     await query.answer()
 
 
-@router.callback_query(SearchCallback.filter(F.action == "contact"))
+@router.callback_query(SearchCallback.filter(F.action == "c"))
 async def contact_seller_from_search(query: CallbackQuery, callback_data: SearchCallback) -> None:
     """Handle contacting seller from search results."""
     book_id = callback_data.book_id
     if not book_id:
-        await query.answer(T("Missing book information."), show_alert=True)
+        await query.answer(_MISSING_BOOK, show_alert=True)
         return
 
-    async with session_scope() as session:
-        book = await get_book_by_id(session, book_id)
-        buyer = await ensure_user(session, query.from_user)
+    book, _ = await asyncio.gather(_load_book(book_id), resolve_user_id(query.from_user))
 
     if book is None or book.is_sold:
-        await query.answer(T("This listing is no longer available."), show_alert=True)
+        await query.answer(_LISTING_UNAVAILABLE, show_alert=True)
         return
 
-    seller_contact = book.seller.public_display() if book.seller else T("Unavailable")
+    seller_contact = book.seller.public_display() if book.seller else _UNAVAILABLE
     buyer_contact = buyer_contact_repr(query.from_user)
 
-    message = T(
-        "Seller contact for '<b>{title}</b>': {contact}\n"
-        "Mention that you're from the Book Swap Marketplace."
-    ).format(title=book.title, contact=seller_contact)
+    message = _SELLER_CONTACT_HTML_TMPL.format(title=book.title, contact=seller_contact)
     await query.message.answer(message, parse_mode="HTML")
 
     await notify_seller_of_interest(
-        query.bot,
         book=book,
-        buyer=buyer,
         buyer_contact=buyer_contact,
     )
-    await query.answer(T("Contact sent! 👌"))
+    await query.answer(_CONTACT_SENT)
 
 
-@router.callback_query(ManageBookCallback.filter(F.action == "mark_sold"))
+@router.callback_query(ManageBookCallback.filter(F.action == "s"))
 async def mark_book_sold(query: CallbackQuery, callback_data: ManageBookCallback) -> None:
     async with session_scope() as session:
-        seller = await ensure_user(session, query.from_user)
-        book = await get_book_by_id(session, callback_data.book_id)
-        if book is None or book.seller_id != seller.id:
-            await query.answer(T("You cannot modify this listing."), show_alert=True)
+        seller_id, book = await asyncio.gather(
+            resolve_user_id(query.from_user),
+            get_book_by_id(session, callback_data.book_id, include_seller=False),
+        )
+        if book is None or book.seller_id != seller_id:
+            await query.answer(_CANNOT_MODIFY, show_alert=True)
             return
         if book.is_sold:
-            await query.answer(T("Already marked as sold."))
+            await query.answer(_ALREADY_SOLD)
             return
         book.mark_sold()
-        await session.flush()
 
-    await query.answer(T("Marked as sold."))
+    await query.answer(_MARKED_SOLD)
     await query.message.edit_text(
-        T("Listing marked as sold. Refresh /mybooks to see remaining items.")
-    )
\ No newline at end of file
+        _MARKED_SOLD_TEXT
+    )
+
+
+# Plain-text menu commands, matched after casefolding. Slash commands are
+# handled by the Command filters above.
+_TEXT_COMMAND_ROUTES: dict[str, Callable] = {
+    **{text: start_post_flow for text in POST_COMMANDS},
+    **{text: browse_books for text in BROWSE_COMMANDS},
+    **{text: start_search for text in SEARCH_COMMANDS},
+    **{text: my_listings for text in MY_LISTINGS_COMMANDS},
+}
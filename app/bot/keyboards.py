@@ -1,66 +1,111 @@
 """Reusable keyboard factories for the bot."""
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Iterable, List, Tuple
 from app.i18n import T
 
 
 from aiogram.filters.callback_data import CallbackData
 from aiogram.types import (
+    InlineKeyboardButton,
     InlineKeyboardMarkup,
     KeyboardButton,
     ReplyKeyboardMarkup,
 )
-from aiogram.utils.keyboard import InlineKeyboardBuilder
 
 from app.db.models import BookCondition
 from .utils import condition_label
 
 
-class ConfirmCallback(CallbackData, prefix="confirm"):
+# Button texts used by per-render keyboards, translated once at import.
+_CONTACT_BUTTON_TMPL = T("Contact: {title}")
+_PREV_BUTTON = T("⬅️ Prev")
+_NEXT_BUTTON = T("Next ➡️")
+_MARK_SOLD_BUTTON_TMPL = T("Mark #{book_id} sold")
+_NEW_SEARCH_BUTTON = T("🔎 New Search")
+
+
+# Callback data is packed as "<prefix>:<value>:..." (field names are not
+# serialized), so prefixes and action tokens are kept to one or two characters
+# to stay well under Telegram's 64-byte callback_data limit.
+
+
+class ConfirmCallback(CallbackData, prefix="c"):
+    """Listing confirmation. Actions: ``y`` confirm, ``x`` cancel."""
+
     action: str
 
 
-class BrowseCallback(CallbackData, prefix="browse"):
+class BrowseCallback(CallbackData, prefix="b"):
+    """Browse pagination. Actions: ``p`` page, ``c`` contact seller."""
+
     action: str
     page: int = 1
     book_id: int | None = None
+    # Keyset cursors: the last book of the previous page / first of the next.
+    after_id: int | None = None
+    before_id: int | None = None
+
 
+class ManageBookCallback(CallbackData, prefix="mg"):
+    """Own listing management. Actions: ``s`` mark sold."""
 
-class ManageBookCallback(CallbackData, prefix="manage"):
     action: str
     book_id: int
 
 
-class MainMenuCallback(CallbackData, prefix="menu"):
+class MyListingsCallback(CallbackData, prefix="ml"):
+    """Own listings pagination. Actions: ``p`` page."""
+
+    action: str
+    page: int = 1
+
+
+class MainMenuCallback(CallbackData, prefix="m"):
+    """Main menu. Actions: ``p`` post, ``b`` browse, ``s`` search, ``l`` my listings."""
+
     action: str
 
 
-class SearchCallback(CallbackData, prefix="search"):
+class SearchCallback(CallbackData, prefix="s"):
+    """Search results. Actions: ``p`` page, ``c`` contact seller."""
+
     action: str
     page: int = 1
     book_id: int | None = None
 
 
-def main_menu_keyboard() -> ReplyKeyboardMarkup:
-    buttons = [
-        [KeyboardButton(text=T("Post a book")), KeyboardButton(text=T("Browse books"))],
-        [KeyboardButton(text=T("My listings"))],
-    ]
-    return ReplyKeyboardMarkup(keyboard=buttons, resize_keyboard=True)
+# Packed callback data for per-book contact buttons. These mirror
+# BrowseCallback/SearchCallback.pack() field order (action, page, book_id, and
+# for browse the empty after_id/before_id cursors) so inbound unpack() still
+# works, but skip a pydantic model per book on every render.
+_BROWSE_CONTACT_DATA = "b:c:{page}:{book_id}::"
+_SEARCH_CONTACT_DATA = "s:c:{page}:{book_id}"
+_NEW_SEARCH_DATA = MainMenuCallback(action="s").pack()
 
 
+@lru_cache(maxsize=1)
 def inline_main_menu_keyboard() -> InlineKeyboardMarkup:
-    """Create an inline keyboard for the main menu."""
-    builder = InlineKeyboardBuilder()
-    builder.button(text=T("📚 Post a book"), callback_data=MainMenuCallback(action="post"))
-    builder.button(text=T("🔍 Browse books"), callback_data=MainMenuCallback(action="browse"))
-    builder.button(text=T("🔎 Search books"), callback_data=MainMenuCallback(action="search"))
-    builder.button(text=T("📋 My listings"), callback_data=MainMenuCallback(action="mybooks"))
-    builder.adjust(2, 2)  # 2 buttons in first row, 2 in second
-    return builder.as_markup()
+    """Create an inline keyboard for the main menu.
+
+    Static keyboards are built once and shared; aiogram never mutates them.
+    """
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(text=T("📚 Post a book"), callback_data=MainMenuCallback(action="p").pack()),
+                InlineKeyboardButton(text=T("🔍 Browse books"), callback_data=MainMenuCallback(action="b").pack()),
+            ],
+            [
+                InlineKeyboardButton(text=T("🔎 Search books"), callback_data=MainMenuCallback(action="s").pack()),
+                InlineKeyboardButton(text=T("📋 My listings"), callback_data=MainMenuCallback(action="l").pack()),
+            ],
+        ]
+    )
 
 
+@lru_cache(maxsize=1)
 def condition_keyboard() -> ReplyKeyboardMarkup:
     rows = []
     current_row: list[KeyboardButton] = []
@@ -75,12 +120,20 @@ def condition_keyboard() -> ReplyKeyboardMarkup:
     return ReplyKeyboardMarkup(keyboard=rows, resize_keyboard=True, one_time_keyboard=True)
 
 
+@lru_cache(maxsize=1)
 def confirm_keyboard() -> InlineKeyboardMarkup:
-    builder = InlineKeyboardBuilder()
-    builder.button(text=T("✅ Confirm"), callback_data=ConfirmCallback(action="confirm"))
-    builder.button(text=T("✖️ Cancel"), callback_data=ConfirmCallback(action="cancel"))
-    builder.adjust(2)
-    return builder.as_markup()
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(text=T("✅ Confirm"), callback_data=ConfirmCallback(action="y").pack()),
+                InlineKeyboardButton(text=T("✖️ Cancel"), callback_data=ConfirmCallback(action="x").pack()),
+            ]
+        ]
+    )
+
+
+# Per-render keyboards below build their rows directly instead of going
+# through InlineKeyboardBuilder, which re-lays out every button on adjust().
 
 
 def browse_keyboard(
@@ -90,36 +143,62 @@ def browse_keyboard(
     total_pages: int,
 ) -> InlineKeyboardMarkup:
     items: List[Tuple[int, str]] = list(books)
-    builder = InlineKeyboardBuilder()
-    for book_id, title in items:
-        builder.button(
-            text=T("Contact: {title}").format(title=title[:32]),
-            callback_data=BrowseCallback(action="contact", book_id=book_id, page=page),
-        )
-    if total_pages > 1:
+    rows = [
+        [
+            InlineKeyboardButton(
+                text=_CONTACT_BUTTON_TMPL.format(title=title[:32]),
+                callback_data=_BROWSE_CONTACT_DATA.format(page=page, book_id=book_id),
+            )
+        ]
+        for book_id, title in items
+    ]
+    if total_pages > 1 and items:
+        nav_row: list[InlineKeyboardButton] = []
         if page > 1:
-            builder.button(
-                text=T("⬅️ Prev"),
-                callback_data=BrowseCallback(action="page", page=page - 1),
+            nav_row.append(
+                InlineKeyboardButton(
+                    text=_PREV_BUTTON,
+                    callback_data=BrowseCallback(action="p", page=page - 1, before_id=items[0][0]).pack(),
+                )
             )
         if page < total_pages:
-            builder.button(
-                text=T("Next ➡️"),
-                callback_data=BrowseCallback(action="page", page=page + 1),
+            nav_row.append(
+                InlineKeyboardButton(
+                    text=_NEXT_BUTTON,
+                    callback_data=BrowseCallback(action="p", page=page + 1, after_id=items[-1][0]).pack(),
+                )
             )
-    builder.adjust(*(1 for _ in range(len(items) or 1)))
-    return builder.as_markup()
+        rows.append(nav_row)
+    return InlineKeyboardMarkup(inline_keyboard=rows)
 
 
-def manage_books_keyboard(book_ids: Iterable[int]) -> InlineKeyboardMarkup:
-    builder = InlineKeyboardBuilder()
-    for book_id in book_ids:
-        builder.button(
-            text=T("Mark #{book_id} sold").format(book_id=book_id),
-            callback_data=ManageBookCallback(action="mark_sold", book_id=book_id),
-        )
-    builder.adjust(1)
-    return builder.as_markup()
+def manage_books_keyboard(
+    book_ids: Iterable[int],
+    *,
+    page: int = 1,
+    total_pages: int = 1,
+) -> InlineKeyboardMarkup:
+    rows = [
+        [
+            InlineKeyboardButton(
+                text=_MARK_SOLD_BUTTON_TMPL.format(book_id=book_id),
+                callback_data=ManageBookCallback(action="s", book_id=book_id).pack(),
+            )
+        ]
+        for book_id in book_ids
+    ]
+    if total_pages > 1:
+        nav_row: list[InlineKeyboardButton] = []
+        if page > 1:
+            nav_row.append(
+                InlineKeyboardButton(text=_PREV_BUTTON, callback_data=MyListingsCallback(action="p", page=page - 1).pack())
+            )
+        if page < total_pages:
+            nav_row.append(
+                InlineKeyboardButton(text=_NEXT_BUTTON, callback_data=MyListingsCallback(action="p", page=page + 1).pack())
+            )
+        rows.append(nav_row)
+    return InlineKeyboardMarkup(inline_keyboard=rows)
 
 
 def search_results_keyboard(
@@ -130,34 +209,32 @@ def search_results_keyboard(
     query: str = "",
 ) -> InlineKeyboardMarkup:
     """Create keyboard for search results with pagination."""
-    items: List[Tuple[int, str]] = list(books)
-    builder = InlineKeyboardBuilder()
-    
     # Contact buttons for each book
-    for book_id, title in items:
-        builder.button(
-            text=T("Contact: {title}").format(title=title[:32]),
-            callback_data=SearchCallback(action="contact", book_id=book_id, page=page),
-        )
-    
+    rows = [
+        [
+            InlineKeyboardButton(
+                text=_CONTACT_BUTTON_TMPL.format(title=title[:32]),
+                callback_data=_SEARCH_CONTACT_DATA.format(page=page, book_id=book_id),
+            )
+        ]
+        for book_id, title in books
+    ]
+
     # Pagination buttons
     if total_pages > 1:
+        nav_row: list[InlineKeyboardButton] = []
         if page > 1:
-            builder.button(
-                text=T("⬅️ Prev"),
-                callback_data=SearchCallback(action="page", page=page - 1),
+            nav_row.append(
+                InlineKeyboardButton(text=_PREV_BUTTON, callback_data=SearchCallback(action="p", page=page - 1).pack())
             )
         if page < total_pages:
-            builder.button(
-                text=T("Next ➡️"),
-                callback_data=SearchCallback(action="page", page=page + 1),
+            nav_row.append(
+                InlineKeyboardButton(text=_NEXT_BUTTON, callback_data=SearchCallback(action="p", page=page + 1).pack())
             )
-    
+        rows.append(nav_row)
+
     # New search button
-    builder.button(
-        text=T("🔎 New Search"),
-        callback_data=MainMenuCallback(action="search"),
+    rows.append(
+        [InlineKeyboardButton(text=_NEW_SEARCH_BUTTON, callback_data=_NEW_SEARCH_DATA)]
     )
-    
-    builder.adjust(*(1 for _ in range(len(items) or 1)))
-    return builder.as_markup()
+    return InlineKeyboardMarkup(inline_keyboard=rows)
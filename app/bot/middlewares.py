@@ -0,0 +1,129 @@
+"""Aiogram middlewares shared by the bot."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Any
+
+from aiogram import BaseMiddleware
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiolimiter import AsyncLimiter
+from cachetools import TTLCache
+
+if TYPE_CHECKING:
+    from aiogram import Bot
+    from aiogram.methods import Response, TelegramMethod
+    from aiogram.types import Message, TelegramObject
+
+# Outgoing API methods that count towards Telegram's flood limits.
+RATE_LIMITED_METHODS = frozenset({"sendMessage", "editMessageText", "answerCallbackQuery"})
+
+# Per-chat limits are averaged over this window so a handler can still send a
+# short burst (e.g. edit + answer + follow-up) without being delayed.
+_CHAT_WINDOW_SECONDS = 3.0
+
+
+class RateLimitMiddleware(BaseRequestMiddleware):
+    """Throttle outgoing requests to stay under Telegram's flood limits.
+
+    Every limited call acquires a per-chat limiter (when the method targets a
+    chat) and then the bot-wide limiter. Per-chat limiters are kept in a
+    bounded LRU so memory stays flat no matter how many chats the bot sees.
+    """
+
+    def __init__(
+        self,
+        *,
+        global_rate: float = 30,
+        chat_rate: float = 1,
+        max_tracked_chats: int = 10_000,
+    ) -> None:
+        self._global = AsyncLimiter(global_rate, 1)
+        self._chat_rate = chat_rate
+        self._max_tracked_chats = max_tracked_chats
+        self._chat_limiters: OrderedDict[int | str, AsyncLimiter] = OrderedDict()
+
+    def _chat_limiter(self, chat_id: int | str) -> AsyncLimiter:
+        limiter = self._chat_limiters.get(chat_id)
+        if limiter is None:
+            limiter = AsyncLimiter(self._chat_rate * _CHAT_WINDOW_SECONDS, _CHAT_WINDOW_SECONDS)
+            self._chat_limiters[chat_id] = limiter
+            if len(self._chat_limiters) > self._max_tracked_chats:
+                self._chat_limiters.popitem(last=False)
+        else:
+            self._chat_limiters.move_to_end(chat_id)
+        return limiter
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[Any],
+        bot: Bot,
+        method: TelegramMethod[Any],
+    ) -> Response[Any]:
+        if method.__api_method__ not in RATE_LIMITED_METHODS:
+            return await make_request(bot, method)
+
+        chat_id = getattr(method, "chat_id", None)
+        if chat_id is not None:
+            # Wait for the chat slot first so a throttled chat does not hold
+            # a bot-wide token while it sleeps.
+            await self._chat_limiter(chat_id).acquire()
+        await self._global.acquire()
+        return await make_request(bot, method)
+
+
+class ErrorsMiddleware(BaseMiddleware):
+    """Tag exceptions raised by handlers with the handler name.
+
+    Nothing is logged here: the exception is re-raised and logged once, with
+    its traceback, by the dispatcher-level error handler, whose traceback
+    shows the note added here.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        try:
+            return await handler(event, data)
+        except Exception as e:
+            handler_object = data.get("handler")
+            name = handler_object.callback.__name__ if handler_object else "unknown"
+            e.add_note(f"Raised in handler {name}")
+            raise
+
+
+class ThrottlingMiddleware(BaseMiddleware):
+    """Drop incoming messages that arrive too quickly from the same chat.
+
+    A chat is remembered for ``rate`` seconds after a handled message; any
+    message from it inside that window is ignored, so flooding a chat cannot
+    queue up database work and replies.
+
+    Commands (e.g. ``/cancel``) and answers inside a conversation flow are
+    never dropped: they are deliberate, and losing one would leave the user
+    without a reply or stuck mid-flow. Register it as an outer middleware
+    after the FSM middleware has put ``raw_state`` into the handler data.
+    """
+
+    def __init__(self, rate: float = 0.5, max_tracked_chats: int = 10_000) -> None:
+        self._recent: TTLCache[int, None] = TTLCache(maxsize=max_tracked_chats, ttl=rate)
+
+    async def __call__(
+        self,
+        handler: Callable[[Message, dict[str, Any]], Awaitable[Any]],
+        event: Message,
+        data: dict[str, Any],
+    ) -> Any:
+        if (event.text or "").startswith("/") or data.get("raw_state") is not None:
+            return await handler(event, data)
+        chat_id = event.chat.id
+        if chat_id in self._recent:
+            return None
+        self._recent[chat_id] = None
+        return await handler(event, data)
@@ -0,0 +1,136 @@
+"""Background delivery of seller notifications.
+
+Handlers enqueue notifications instead of sending them inline. A single worker
+task drains the queue, coalesces messages addressed to the same chat within a
+short window and sends one combined message per chat.
+"""
+from __future__ import annotations
+
+import asyncio
+from contextlib import suppress
+from typing import Optional
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramForbiddenError, TelegramNotFound
+
+from app.logger import logger
+
+# How long the worker waits for more notifications before flushing a batch.
+COALESCE_WINDOW_SECONDS = 2.0
+# Upper bound on notifications handled per flush.
+MAX_BATCH_SIZE = 100
+# Pending notifications before producers have to wait for the worker.
+MAX_QUEUE_SIZE = 10_000
+# Telegram rejects messages longer than this.
+MAX_MESSAGE_LENGTH = 4096
+# How long shutdown waits for queued notifications to be delivered.
+SHUTDOWN_TIMEOUT_SECONDS = 10.0
+
+_queue: asyncio.Queue[tuple[int, str]] = asyncio.Queue(maxsize=MAX_QUEUE_SIZE)
+_worker: Optional[asyncio.Task] = None
+# Set while shutting down: no new notifications, no coalescing delay.
+_stopping = asyncio.Event()
+
+
+async def enqueue_notification(chat_id: int, text: str) -> None:
+    """Schedule ``text`` for delivery to ``chat_id``.
+
+    Only waits when the queue is full, i.e. when the worker is far behind.
+    Notifications arriving during shutdown are dropped.
+    """
+
+    if _stopping.is_set():
+        logger.warning(f"Dropped notification to {chat_id}: shutting down")
+        return
+    await _queue.put((chat_id, text))
+
+
+def _drain(batch: list[tuple[int, str]]) -> None:
+    while len(batch) < MAX_BATCH_SIZE:
+        try:
+            batch.append(_queue.get_nowait())
+        except asyncio.QueueEmpty:
+            return
+
+
+def _group_by_chat(batch: list[tuple[int, str]]) -> dict[int, list[str]]:
+    """Group texts per chat, dropping exact duplicates (e.g. repeated taps)."""
+
+    grouped: dict[int, list[str]] = {}
+    for chat_id, text in batch:
+        texts = grouped.setdefault(chat_id, [])
+        if text not in texts:
+            texts.append(text)
+    return grouped
+
+
+def _join_texts(texts: list[str]) -> list[str]:
+    """Join texts into as few messages as fit Telegram's length limit."""
+
+    messages: list[str] = []
+    current = ""
+    for text in texts:
+        candidate = f"{current}\n\n{text}" if current else text
+        if len(candidate) <= MAX_MESSAGE_LENGTH:
+            current = candidate
+            continue
+        if current:
+            messages.append(current)
+        current = text[:MAX_MESSAGE_LENGTH]
+    if current:
+        messages.append(current)
+    return messages
+
+
+async def _notify_worker(bot: Bot) -> None:
+    while True:
+        batch = [await _queue.get()]
+        # Wait for more messages to coalesce, unless shutdown wants a flush.
+        with suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(_stopping.wait(), COALESCE_WINDOW_SECONDS)
+        _drain(batch)
+        try:
+            for chat_id, texts in _group_by_chat(batch).items():
+                try:
+                    for message in _join_texts(texts):
+                        await bot.send_message(chat_id=chat_id, text=message)
+                except (TelegramForbiddenError, TelegramNotFound):
+                    # The recipient cannot be contacted directly by the bot.
+                    pass
+                except Exception as e:
+                    logger.error(f"Failed to deliver notification to {chat_id}: {e}", exc_info=True)
+        finally:
+            for _ in batch:
+                _queue.task_done()
+
+
+def start_notify_worker(bot: Bot) -> None:
+    """Start the background notification worker if it is not running."""
+
+    global _worker
+    if _worker is None or _worker.done():
+        _stopping.clear()
+        _worker = asyncio.create_task(_notify_worker(bot), name="seller-notifications")
+
+
+async def stop_notify_worker(timeout: float = SHUTDOWN_TIMEOUT_SECONDS) -> None:
+    """Deliver queued notifications, then stop the background worker.
+
+    New notifications are refused from here on. The worker gets up to
+    ``timeout`` seconds to flush the queue (including a batch waiting out the
+    coalesce window) before it is cancelled.
+    """
+
+    global _worker
+    if _worker is None:
+        return
+    _stopping.set()
+    if not _worker.done():
+        try:
+            await asyncio.wait_for(_queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Shutdown left {_queue.qsize()} notification(s) undelivered")
+    _worker.cancel()
+    with suppress(asyncio.CancelledError):
+        await _worker
+    _worker = None
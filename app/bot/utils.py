@@ -1,168 +1,379 @@
 """Utility helpers for Telegram bot interactions."""
 from __future__ import annotations
 
-from collections.abc import Sequence
+from collections.abc import Mapping, Sequence
+from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import Any, Optional
 
 
-from aiogram import Bot, types
-from aiogram.exceptions import TelegramForbiddenError, TelegramNotFound
-from sqlalchemy import func, select
-from sqlalchemy.orm import selectinload
+from aiogram import types
+from cachetools import TTLCache
+from sqlalchemy import RowMapping, bindparam, func, insert, literal, not_, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import contains_eager, selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
-from app.db.models import Book, BookCondition, User
+from app.db.models import Book, BookCondition, User, public_display
+from app.db.session import session_scope
 from app.i18n import T
 
+from .notifications import enqueue_notification
+
 settings = get_settings()
 
+# Dialect-specific INSERT constructs supporting ON CONFLICT upserts.
+_DIALECT_INSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
+# telegram_id -> (users.id, username, display_name) for recently seen users.
+_USER_CACHE: TTLCache[int, tuple[int, Optional[str], str]] = TTLCache(maxsize=10_000, ttl=300)
+
+# Columns rendered by format_book_row.
+_BOOK_ROW_COLUMNS = (
+    Book.id,
+    Book.title,
+    Book.author,
+    Book.condition,
+    Book.price_cents,
+    Book.created_at,
+    User.telegram_id.label("seller_telegram_id"),
+    User.username.label("seller_username"),
+    User.display_name.label("seller_display_name"),
+)
+
+# Escape character for LIKE patterns built from user input.
+_LIKE_ESCAPE = "\\"
+
+# Fixed-shape statements are built once; calls only bind their parameters.
+_USER_BY_TELEGRAM_ID = select(User).where(User.telegram_id == bindparam("telegram_id"))
+
+# Static texts and templates are translated once at import.
+_BOOK_SUMMARY_TMPL = T("<b>{title}</b>\nAuthor: {author}\nCondition: {condition}\nPrice: {price}\nListed: {listed}\nSeller: {seller}\nBook ID: {book_id}")
+_NOTIFY_TMPL = T("📚 Someone is interested in your book!\n\nBook: {book_title}\nBuyer: {buyer_contact}\nReply directly in Telegram to arrange the exchange.")
+_UNKNOWN = T("Unknown")
+_CONDITION_LABELS: dict[str, str] = {
+    BookCondition.NEW.value: T("New"),
+    BookCondition.LIKE_NEW.value: T("Like new"),
+    BookCondition.GOOD.value: T("Good"),
+    BookCondition.ACCEPTABLE.value: T("Acceptable"),
+    BookCondition.POOR.value: T("Poor"),
+}
+
 
 def condition_label(condition: BookCondition | str) -> str:
     """Return a human-friendly label for a book condition."""
 
     value = condition.value if isinstance(condition, BookCondition) else str(condition)
-    mapping = {
-        BookCondition.NEW.value: T("New"),
-        BookCondition.LIKE_NEW.value: T("Like new"),
-        BookCondition.GOOD.value: T("Good"),
-        BookCondition.ACCEPTABLE.value: T("Acceptable"),
-        BookCondition.POOR.value: T("Poor"),
-    }
-    return mapping.get(value, value.title())
+    return _CONDITION_LABELS.get(value) or value.title()
 
 
 def format_price(price: Decimal | str | None) -> str:
     if price is None:
         return "—"
+    if isinstance(price, Decimal):
+        return f"{price:.2f}"
     return f"{Decimal(price):.2f}"
 
 
-def format_book_summary(book: Book) -> str:
-    """Generate a concise multi-line summary of a book."""
-    template = T("<b>{title}</b>\nAuthor: {author}\nCondition: {condition}\nPrice: {price}\nListed: {listed}\nSeller: {seller}\nBook ID: {book_id}")
-    
-    return template.format(
-        title=book.title,
-        author=book.author or T('Unknown'),
-        condition=condition_label(book.condition),
-        price=format_price(book.price),
-        listed=book.created_at.strftime('%Y-%m-%d %H:%M UTC') if book.created_at else '—',
-        seller=book.seller.public_display() if book.seller else T('Unknown'),
-        book_id=book.id
-    )
+def format_cents(cents: int | None) -> str:
+    """Format a price stored in cents without going through Decimal."""
+    if cents is None:
+        return "—"
+    units, cents = divmod(cents, 100)
+    return f"{units}.{cents:02d}"
 
 
-async def ensure_user(session: AsyncSession, tg_user: types.User) -> User:
-    """Ensure a User row exists and is up-to-date."""
+def _format_listed(created_at: Optional[datetime]) -> str:
+    if created_at is None:
+        return "—"
+    # Same text as strftime('%Y-%m-%d %H:%M UTC'), but much cheaper.
+    return f"{created_at.isoformat(' ', 'minutes')[:16]} UTC"
 
-    result = await session.execute(select(User).where(User.telegram_id == tg_user.id))
-    user = result.scalar_one_or_none()
 
-    display_name = tg_user.full_name or tg_user.first_name or tg_user.username or str(tg_user.id)
-    username = tg_user.username
+def format_book_summary(book: Book, seller: Optional[User] = None) -> str:
+    """Generate a concise multi-line summary of a book.
 
-    if user is None:
-        user = User(
-            telegram_id=tg_user.id,
-            username=username,
-            display_name=display_name,
+    Pass ``seller`` when the caller already has it, e.g. for the user's own
+    listings; ``book.seller`` is then never touched and need not be loaded.
+    """
+    if seller is None:
+        seller = book.seller
+    return _BOOK_SUMMARY_TMPL.format_map({
+        "title": book.title,
+        "author": book.author or _UNKNOWN,
+        "condition": condition_label(book.condition),
+        "price": format_cents(book.price_cents),
+        "listed": _format_listed(book.created_at),
+        "seller": seller.public_display() if seller else _UNKNOWN,
+        "book_id": book.id,
+    })
+
+
+def format_book_row(row: Mapping[str, Any]) -> str:
+    """Like :func:`format_book_summary`, for rows from :func:`paginate_books_lite`."""
+    return _BOOK_SUMMARY_TMPL.format_map({
+        "title": row["title"],
+        "author": row["author"] or _UNKNOWN,
+        "condition": condition_label(row["condition"]),
+        "price": format_cents(row["price_cents"]),
+        "listed": _format_listed(row["created_at"]),
+        "seller": public_display(row["seller_username"], row["seller_display_name"], row["seller_telegram_id"]),
+        "book_id": row["id"],
+    })
+
+
+def _user_fields(tg_user: types.User) -> dict[str, object]:
+    return {
+        "telegram_id": tg_user.id,
+        "username": tg_user.username,
+        "display_name": tg_user.full_name or tg_user.first_name or tg_user.username or str(tg_user.id),
+    }
+
+
+def user_from_telegram(tg_user: types.User) -> User:
+    """Build an unsaved :class:`User` mirroring what :func:`ensure_user` stores.
+
+    Useful for rendering the current user (e.g. as seller of their own
+    listings) without loading the row.
+    """
+
+    return User(**_user_fields(tg_user))
+
+
+async def ensure_user(session: AsyncSession, tg_user: types.User) -> User:
+    """Ensure a User row exists and is up-to-date.
+
+    Uses a single ``INSERT ... ON CONFLICT (telegram_id) DO UPDATE ... RETURNING``
+    statement and records the stored row in the user cache. The update
+    only fires when the username or display name changed, so repeat visits do
+    not rewrite the row; in that case the existing row is read back instead.
+    """
+
+    dialect_insert = _DIALECT_INSERTS[session.get_bind().dialect.name]
+    stmt = dialect_insert(User).values(**_user_fields(tg_user))
+    stmt = (
+        stmt.on_conflict_do_update(
+            index_elements=[User.telegram_id],
+            set_={"username": stmt.excluded.username, "display_name": stmt.excluded.display_name},
+            where=(
+                User.username.is_distinct_from(stmt.excluded.username)
+                | User.display_name.is_distinct_from(stmt.excluded.display_name)
+            ),
         )
-        session.add(user)
-        await session.flush()
-        return user
-
-    updated = False
-    if username != user.username:
-        user.username = username
-        updated = True
-    if display_name != user.display_name:
-        user.display_name = display_name
-        updated = True
-    if updated:
-        await session.flush()
+        .returning(User)
+        .execution_options(populate_existing=True)
+    )
+    user = (await session.execute(stmt)).scalar_one_or_none()
+    if user is None:
+        user = await session.scalar(_USER_BY_TELEGRAM_ID, {"telegram_id": tg_user.id})
+    _USER_CACHE[tg_user.id] = (user.id, user.username, user.display_name)
     return user
 
 
-async def paginate_books(
+async def resolve_user_id(tg_user: types.User) -> int:
+    """Return the internal user id for a Telegram user.
+
+    Repeat callers whose username and name are unchanged are answered from an
+    in-memory TTL cache without any SQL; a cache miss or a changed profile
+    opens a session and runs :func:`ensure_user`.
+    """
+
+    cached = _USER_CACHE.get(tg_user.id)
+    if cached is not None:
+        user_id, username, display_name = cached
+        fields = _user_fields(tg_user)
+        if username == fields["username"] and display_name == fields["display_name"]:
+            return user_id
+    async with session_scope() as session:
+        user = await ensure_user(session, tg_user)
+    return user.id
+
+
+async def create_book(
+    session: AsyncSession,
+    *,
+    seller_id: int,
+    title: str,
+    author: Optional[str],
+    price_cents: int,
+    condition: BookCondition,
+    description: Optional[str],
+) -> int:
+    """Insert a listing and return its id.
+
+    ``INSERT ... RETURNING`` yields the id without a separate flush round-trip.
+    """
+
+    return await session.scalar(
+        insert(Book)
+        .values(
+            title=title,
+            author=author,
+            price_cents=price_cents,
+            condition=condition,
+            description=description,
+            seller_id=seller_id,
+        )
+        .returning(Book.id)
+    )
+
+
+def _keyset_cursor(book_id: int):
+    """Return the ``(created_at, id)`` sort key of ``book_id`` for keyset seeks."""
+
+    created_at = select(Book.created_at).where(Book.id == book_id).scalar_subquery()
+    return tuple_(created_at, literal(book_id))
+
+
+async def _fetch_page_with_total(
+    session: AsyncSession,
+    stmt,
+    filters,
+    *,
+    first_page: bool,
+    as_mappings: bool = False,
+) -> tuple[list, int]:
+    """Run a page query with a trailing ``total`` column and split rows from it.
+
+    Items are the first column of each row (the ``Book``), or each row's
+    mapping when ``as_mappings`` is set. An empty page carries no total, so a
+    separate count is issued only when a page past the first comes back empty
+    (e.g. the listings shrank meanwhile).
+    """
+
+    rows = (await session.execute(stmt)).all()
+    if rows:
+        items = [row._mapping for row in rows] if as_mappings else [row[0] for row in rows]
+        return items, rows[0].total
+    if first_page:
+        return [], 0
+    count_stmt = select(func.count()).select_from(select(Book.id).where(*filters).subquery())
+    return [], await session.scalar(count_stmt) or 0
+
+
+def _browse_filters(include_sold: bool) -> list:
+    if include_sold:
+        return []
+    # Spelled to match the ix_books_browse partial index predicate.
+    return [not_(Book.is_sold)]
+
+
+async def paginate_books_lite(
     session: AsyncSession,
     *,
     page: int,
     per_page: int,
-    include_sold: bool = False,
-) -> tuple[list[Book], int, int]:
-    """Return books for the given page.
+    after_id: Optional[int] = None,
+    before_id: Optional[int] = None,
+) -> tuple[list[RowMapping], int, int]:
+    """Return one browse page of unsold books, newest first, for rendering.
 
-    Returns a tuple of (books, total_count, total_pages).
-    """
+    Selects only the columns :func:`format_book_row` needs, joined with the
+    seller, and returns plain row mappings instead of ORM objects.
 
-    filters = []
-    if not include_sold:
-        filters.append(Book.is_sold.is_(False))
+    When ``after_id`` or ``before_id`` is given, the page is located with a
+    keyset seek relative to that book (the last book of the previous page or
+    the first book of the next page) instead of ``OFFSET``, so deep pages cost
+    the same as the first one. ``page`` is then only used for display.
+
+    Returns a tuple of (rows, total_count, total_pages).
+    """
 
+    filters = _browse_filters(include_sold=False)
+    # The total rides along as an uncorrelated scalar subquery rather than
+    # COUNT(*) OVER (): keyset predicates narrow the page query, but the total
+    # must cover every listing matching ``filters``.
+    total = select(func.count(Book.id)).where(*filters).scalar_subquery().label("total")
     stmt = (
-        select(Book)
-        .options(selectinload(Book.seller))
+        select(*_BOOK_ROW_COLUMNS, total)
+        .join(User, User.id == Book.seller_id)
         .where(*filters)
-        .order_by(Book.created_at.desc())
-        .offset((page - 1) * per_page)
-        .limit(per_page)
     )
-    result = await session.execute(stmt)
-    books = list(result.scalars())
 
-    count_stmt = select(func.count()).select_from(select(Book.id).where(*filters).subquery())
-    total = await session.scalar(count_stmt) or 0
+    position = tuple_(Book.created_at, Book.id)
+    if after_id is not None:
+        stmt = stmt.where(position < _keyset_cursor(after_id)).order_by(Book.created_at.desc(), Book.id.desc())
+    elif before_id is not None:
+        # Seek backwards (oldest first), then reverse the rows below.
+        stmt = stmt.where(position > _keyset_cursor(before_id)).order_by(Book.created_at.asc(), Book.id.asc())
+    else:
+        stmt = stmt.order_by(Book.created_at.desc(), Book.id.desc()).offset((page - 1) * per_page)
+    stmt = stmt.limit(per_page)
 
-    total_pages = max(1, (total + per_page - 1) // per_page) if total else 1
-    return books, total, total_pages
+    first_page = page == 1 and after_id is None and before_id is None
+    rows, total_count = await _fetch_page_with_total(session, stmt, filters, first_page=first_page, as_mappings=True)
+    if before_id is not None:
+        rows.reverse()
+
+    total_pages = max(1, (total_count + per_page - 1) // per_page) if total_count else 1
+    return rows, total_count, total_pages
 
 
 async def notify_seller_of_interest(
-    bot: Bot,
     *,
     book: Book,
-    buyer: User,
     buyer_contact: str,
 ) -> None:
-    """Send a notification to the seller about buyer interest."""
+    """Queue a notification to the seller about buyer interest.
+
+    Delivery happens in the background worker from :mod:`.notifications`,
+    which batches notifications per seller.
+    """
 
-    template = T("📚 Someone is interested in your book!\n\nBook: {book_title}\nBuyer: {buyer_contact}\nReply directly in Telegram to arrange the exchange.")
-    message = template.format(
+    if book.seller is None:
+        return
+    message = _NOTIFY_TMPL.format(
         book_title=book.title,
         buyer_contact=buyer_contact
     )
-    try:
-        await bot.send_message(chat_id=book.seller.telegram_id, text=message)
-    except (TelegramForbiddenError, TelegramNotFound):
-        # The seller cannot be contacted directly by the bot.
-        pass
+    await enqueue_notification(book.seller.telegram_id, message)
 
 
-async def get_user_books(
+async def paginate_user_books(
     session: AsyncSession,
     *,
     seller_id: int,
+    page: int,
+    per_page: int,
     include_sold: bool = False,
-) -> list[Book]:
+) -> tuple[list[Book], int, int]:
+    """Return one page of a seller's listings, newest first.
+
+    The seller relationship is left unloaded; render the books with
+    ``format_book_summary(book, seller=...)``.
+
+    Returns a tuple of (books, total_count, total_pages).
+    """
+
+    filters = [Book.seller_id == seller_id, *_browse_filters(include_sold)]
     stmt = (
-        select(Book)
-        .options(selectinload(Book.seller))
-        .where(Book.seller_id == seller_id)
-        .order_by(Book.created_at.desc())
+        select(Book, func.count().over().label("total"))
+        .where(*filters)
+        .order_by(Book.created_at.desc(), Book.id.desc())
+        .offset((page - 1) * per_page)
+        .limit(per_page)
     )
-    if not include_sold:
-        stmt = stmt.where(Book.is_sold.is_(False))
-    result = await session.execute(stmt)
-    return list(result.scalars())
+    books, total = await _fetch_page_with_total(session, stmt, filters, first_page=page == 1)
 
+    total_pages = max(1, (total + per_page - 1) // per_page) if total else 1
+    return books, total, total_pages
 
-async def get_book_by_id(session: AsyncSession, book_id: int) -> Optional[Book]:
-    result = await session.execute(
-        select(Book).options(selectinload(Book.seller)).where(Book.id == book_id)
-    )
-    return result.scalar_one_or_none()
+
+async def get_book_by_id(
+    session: AsyncSession,
+    book_id: int,
+    *,
+    include_seller: bool = True,
+) -> Optional[Book]:
+    """Return a book by primary key, or ``None``.
+
+    Uses :meth:`AsyncSession.get`, so a book already in the session's
+    identity map is returned without SQL.
+    """
+    options = [selectinload(Book.seller)] if include_seller else []
+    return await session.get(Book, book_id, options=options)
 
 
 def buyer_contact_repr(tg_user: types.User) -> str:
@@ -173,6 +384,11 @@ def buyer_contact_repr(tg_user: types.User) -> str:
     return f"tg:{tg_user.id}"
 
 
+def escape_like(term: str) -> str:
+    """Escape LIKE wildcards in ``term`` for use with ``escape=_LIKE_ESCAPE``."""
+    return term.replace(_LIKE_ESCAPE, _LIKE_ESCAPE * 2).replace("%", f"{_LIKE_ESCAPE}%").replace("_", f"{_LIKE_ESCAPE}_")
+
+
 async def search_books(
     session: AsyncSession,
     *,
@@ -185,33 +401,43 @@ async def search_books(
     
     Returns a tuple of (books, total_count, total_pages).
     """
-    if not query.strip():
+    term = query.strip()
+    if not term:
         return [], 0, 1
-    
-    search_term = f"%{query.strip().lower()}%"
-    
-    filters = [
-        func.lower(Book.title).like(search_term) |  
-        func.lower(Book.author).like(search_term) |
-        func.lower(Book.description).like(search_term)
-    ]
-    
+
+    # Substring match on every backend; "%" and "_" in the term are literal.
+    if session.get_bind().dialect.name == "postgresql":
+        # Each ILIKE is served by that column's pg_trgm GIN index (for terms
+        # of at least one trigram; shorter ones scan).
+        pattern = f"%{escape_like(term)}%"
+        filters = [
+            Book.title.ilike(pattern, escape=_LIKE_ESCAPE) |
+            Book.author.ilike(pattern, escape=_LIKE_ESCAPE) |
+            Book.description.ilike(pattern, escape=_LIKE_ESCAPE)
+        ]
+    else:
+        search_term = f"%{escape_like(term.lower())}%"
+        filters = [
+            func.lower(Book.title).like(search_term, escape=_LIKE_ESCAPE) |
+            func.lower(Book.author).like(search_term, escape=_LIKE_ESCAPE) |
+            func.lower(Book.description).like(search_term, escape=_LIKE_ESCAPE)
+        ]
+
     if not include_sold:
-        filters.append(Book.is_sold.is_(False))
+        filters.append(not_(Book.is_sold))
 
+    # Join the seller into the same statement rather than a second
+    # selectinload query; every book has one.
     stmt = (
-        select(Book)
-        .options(selectinload(Book.seller))
+        select(Book, func.count().over().label("total"))
+        .join(Book.seller)
+        .options(contains_eager(Book.seller))
         .where(*filters)
-        .order_by(Book.created_at.desc())
+        .order_by(Book.created_at.desc(), Book.id.desc())
         .offset((page - 1) * per_page)
         .limit(per_page)
     )
-    result = await session.execute(stmt)
-    books = list(result.scalars())
-
-    count_stmt = select(func.count()).select_from(select(Book.id).where(*filters).subquery())
-    total = await session.scalar(count_stmt) or 0
+    books, total = await _fetch_page_with_total(session, stmt, filters, first_page=page == 1)
 
     total_pages = max(1, (total + per_page - 1) // per_page) if total else 1
     return books, total, total_pages
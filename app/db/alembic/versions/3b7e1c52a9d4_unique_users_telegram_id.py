@@ -0,0 +1,32 @@
+"""unique_users_telegram_id
+
+Revision ID: 3b7e1c52a9d4
+Revises: 8f096d0de9f2
+Create Date: 2026-10-15 09:12:31.402715
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7e1c52a9d4'
+down_revision: Union[str, Sequence[str], None] = '8f096d0de9f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ensure_user upserts with ON CONFLICT (telegram_id), which needs a unique index.
+    op.drop_index(op.f('ix_users_telegram_id'), table_name='users')
+    op.create_index(op.f('ix_users_telegram_id'), 'users', ['telegram_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_users_telegram_id'), table_name='users')
+    op.create_index(op.f('ix_users_telegram_id'), 'users', ['telegram_id'], unique=False)
@@ -0,0 +1,40 @@
+"""add_book_prefix_search_indexes
+
+Revision ID: 5d81c4e7a2b9
+Revises: e2f6a9c13b08
+Create Date: 2026-10-15 15:47:12.604281
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d81c4e7a2b9'
+down_revision: Union[str, Sequence[str], None] = 'e2f6a9c13b08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Short search terms fall back to lower(column) LIKE 'term%' on these columns.
+PREFIX_COLUMNS = ('title', 'author')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for column in PREFIX_COLUMNS:
+        op.execute(
+            f'CREATE INDEX IF NOT EXISTS ix_books_{column}_lower ON books (lower({column}) text_pattern_ops)'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for column in PREFIX_COLUMNS:
+        op.execute(f'DROP INDEX IF EXISTS ix_books_{column}_lower')
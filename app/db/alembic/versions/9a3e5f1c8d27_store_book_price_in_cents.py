@@ -0,0 +1,47 @@
+"""store_book_price_in_cents
+
+Revision ID: 9a3e5f1c8d27
+Revises: 5d81c4e7a2b9
+Create Date: 2026-10-15 16:30:55.871403
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a3e5f1c8d27'
+down_revision: Union[str, Sequence[str], None] = '5d81c4e7a2b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # BIGINT: Numeric(10, 2) goes up to 99,999,999.99, i.e. more cents than a
+    # 32-bit INTEGER holds.
+    # batch_alter_table recreates the table on SQLite, which cannot alter
+    # columns or constraints in place; other databases get plain ALTERs.
+    with op.batch_alter_table('books') as batch_op:
+        batch_op.add_column(sa.Column('price_cents', sa.BigInteger(), nullable=True))
+    op.execute('UPDATE books SET price_cents = CAST(ROUND(price * 100) AS BIGINT)')
+    with op.batch_alter_table('books') as batch_op:
+        batch_op.alter_column('price_cents', existing_type=sa.BigInteger(), nullable=False)
+        batch_op.drop_constraint('ck_books_price_nonnegative', type_='check')
+        batch_op.create_check_constraint('ck_books_price_cents_nonnegative', 'price_cents >= 0')
+        batch_op.drop_column('price')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('books') as batch_op:
+        batch_op.add_column(sa.Column('price', sa.Numeric(precision=10, scale=2), nullable=True))
+    op.execute('UPDATE books SET price = price_cents / 100.0')
+    with op.batch_alter_table('books') as batch_op:
+        batch_op.alter_column('price', existing_type=sa.Numeric(precision=10, scale=2), nullable=False)
+        batch_op.drop_constraint('ck_books_price_cents_nonnegative', type_='check')
+        batch_op.create_check_constraint('ck_books_price_nonnegative', 'price >= 0')
+        batch_op.drop_column('price_cents')
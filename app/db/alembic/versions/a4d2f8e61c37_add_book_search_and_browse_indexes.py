@@ -0,0 +1,48 @@
+"""add_book_search_and_browse_indexes
+
+Revision ID: a4d2f8e61c37
+Revises: 3b7e1c52a9d4
+Create Date: 2026-10-15 10:03:54.118042
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d2f8e61c37'
+down_revision: Union[str, Sequence[str], None] = '3b7e1c52a9d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Expression searched by app/bot/utils.py at the time of this revision.
+SEARCH_DOCUMENT = (
+    "(coalesce(title, '') || ' ' || coalesce(author, '') || ' ' || coalesce(description, ''))"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_books_browse',
+        'books',
+        [sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+        postgresql_where=sa.text('NOT is_sold'),
+        sqlite_where=sa.text('NOT is_sold'),
+    )
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        op.execute(
+            f'CREATE INDEX ix_books_search_trgm ON books USING gin ({SEARCH_DOCUMENT} gin_trgm_ops)'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_books_search_trgm')
+    op.drop_index('ix_books_browse', table_name='books')
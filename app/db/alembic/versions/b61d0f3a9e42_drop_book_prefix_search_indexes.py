@@ -0,0 +1,41 @@
+"""drop_book_prefix_search_indexes
+
+Revision ID: b61d0f3a9e42
+Revises: 9a3e5f1c8d27
+Create Date: 2026-10-15 22:40:18.207135
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b61d0f3a9e42'
+down_revision: Union[str, Sequence[str], None] = '9a3e5f1c8d27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Search matches substrings for every term length again, so nothing runs the
+# lower(column) LIKE 'term%' queries these indexes were built for.
+PREFIX_COLUMNS = ('title', 'author')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for column in PREFIX_COLUMNS:
+        op.execute(f'DROP INDEX IF EXISTS ix_books_{column}_lower')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for column in PREFIX_COLUMNS:
+        op.execute(
+            f'CREATE INDEX IF NOT EXISTS ix_books_{column}_lower ON books (lower({column}) text_pattern_ops)'
+        )
@@ -0,0 +1,49 @@
+"""per_column_book_trigram_indexes
+
+Revision ID: c7b93e04d1f5
+Revises: a4d2f8e61c37
+Create Date: 2026-10-15 14:21:07.530914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7b93e04d1f5'
+down_revision: Union[str, Sequence[str], None] = 'a4d2f8e61c37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_COLUMNS = ('title', 'author', 'description')
+
+# Previous combined index, see a4d2f8e61c37.
+SEARCH_DOCUMENT = (
+    "(coalesce(title, '') || ' ' || coalesce(author, '') || ' ' || coalesce(description, ''))"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for column in SEARCH_COLUMNS:
+        op.execute(
+            f'CREATE INDEX IF NOT EXISTS ix_books_{column}_trgm ON books USING gin ({column} gin_trgm_ops)'
+        )
+    op.execute('DROP INDEX IF EXISTS ix_books_search_trgm')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute(
+        f'CREATE INDEX IF NOT EXISTS ix_books_search_trgm ON books USING gin ({SEARCH_DOCUMENT} gin_trgm_ops)'
+    )
+    for column in SEARCH_COLUMNS:
+        op.execute(f'DROP INDEX IF EXISTS ix_books_{column}_trgm')
@@ -0,0 +1,37 @@
+"""add_books_seller_index
+
+Revision ID: e2f6a9c13b08
+Revises: c7b93e04d1f5
+Create Date: 2026-10-15 15:02:48.216390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2f6a9c13b08'
+down_revision: Union[str, Sequence[str], None] = 'c7b93e04d1f5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_books_seller_is_sold_created_at',
+        'books',
+        ['seller_id', 'is_sold', sa.text('created_at DESC')],
+        unique=False,
+    )
+    # Browsing is served by ix_books_browse since a4d2f8e61c37.
+    op.drop_index('ix_books_is_sold_created_at', table_name='books')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_books_is_sold_created_at', 'books', ['is_sold', 'created_at'], unique=False)
+    op.drop_index('ix_books_seller_is_sold_created_at', table_name='books')
@@ -1,12 +1,21 @@
 from alembic.config import Config
 from alembic.command import upgrade
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 import asyncio
 
+_CONF_PATH = Path(__file__).parent/'alembic'/'alembic.ini'
+
+@lru_cache(maxsize=1)
+def _alembic_config() -> Config:
+    return Config(str(_CONF_PATH))
+
 def _run_migrations():
-    conf_path = Path(__file__).parent/'alembic'/'alembic.ini'
-    conf = Config(str(conf_path))
-    upgrade(conf, 'head')
+    upgrade(_alembic_config(), 'head')
 
 async def run_migrations():
-    await asyncio.get_running_loop().run_in_executor(None, _run_migrations)
\ No newline at end of file
+    # A dedicated thread keeps Alembic's blocking work off the loop's default
+    # executor, which other blocking calls share.
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix='alembic') as executor:
+        await asyncio.get_running_loop().run_in_executor(executor, _run_migrations)
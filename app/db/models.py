@@ -3,29 +3,42 @@
 from decimal import Decimal, ROUND_HALF_UP
 from typing import List, Optional
 from enum import Enum
-from datetime import datetime, timezone
+from datetime import datetime
 
 from sqlalchemy import (
+    BigInteger,
     Column,
     DateTime,
     Enum as SAEnum,
     Integer,
     String,
-    Numeric,
     Boolean,
     func,
     Index,
     CheckConstraint,
     ForeignKey,
+    text,
 )
 from sqlalchemy.orm import Mapped
 from sqlmodel import SQLModel, Field, Column as SQLColumn, JSON, Relationship
 from pydantic import field_validator
 
 
-def _utc_now() -> datetime:
-    """Return a timezone-aware UTC datetime."""
-    return datetime.now(timezone.utc)
+def public_display(username: Optional[str], display_name: Optional[str], telegram_id: int) -> str:
+    """Return a human friendly contact string for a user's stored fields."""
+    if username:
+        return f"@{username}"
+    if display_name:
+        return display_name
+    return f"tg:{telegram_id}"
+
+
+def price_to_cents(value: Decimal | str | int | float) -> int:
+    """Convert a price in currency units to whole cents (half-up rounding)."""
+    cents = int((Decimal(str(value)) * 100).to_integral_value(rounding=ROUND_HALF_UP))
+    if cents < 0:
+        raise ValueError("price must be non-negative")
+    return cents
 
 
 # --- Domain enums ---
@@ -44,15 +57,17 @@ class User(SQLModel, table=True):
         default=None, sa_column=Column(Integer, primary_key=True)
     )
 
-    telegram_id: int = Field(..., index=True, description="Telegram user id")
+    telegram_id: int = Field(..., index=True, unique=True, description="Telegram user id")
     username: Optional[str] = Field(
         None, max_length=64, description="Telegram username (without @)"
     )
     display_name: Optional[str] = Field(None, max_length=128)
     contact_phone: Optional[str] = Field(None, max_length=32, description="Optional phone")
 
-    created_at: datetime = Field(
-        default_factory=_utc_now,
+    # Filled in by the database on insert (server_default), so the column is
+    # left out of INSERTs rather than sent from Python.
+    created_at: Optional[datetime] = Field(
+        default=None,
         sa_column=Column(DateTime(timezone=True), server_default=func.now(), nullable=False),
         description="Record creation timestamp (UTC)",
     )
@@ -64,33 +79,40 @@ class User(SQLModel, table=True):
 
     def public_display(self) -> str:
         """Return a human friendly contact string for showing to buyers."""
-        if self.username:
-            return f"@{self.username}"
-        if self.display_name:
-            return self.display_name
-        return f"tg:{self.telegram_id}"
+        return public_display(self.username, self.display_name, self.telegram_id)
 
 
 class Book(SQLModel, table=True):
     __tablename__ = "books"
     # table args: indexes and constraints
     __table_args__ = (
-        CheckConstraint("price >= 0", name="ck_books_price_nonnegative"),
+        CheckConstraint("price_cents >= 0", name="ck_books_price_cents_nonnegative"),
         Index("ix_books_title", "title"),
         Index("ix_books_author", "author"),
-        Index("ix_books_is_sold_created_at", "is_sold", "created_at"),
+        # A seller's listings, newest first (paginate_user_books).
+        Index("ix_books_seller_is_sold_created_at", "seller_id", "is_sold", text("created_at DESC")),
+        # Newest-first browsing of unsold books; id breaks created_at ties.
+        Index(
+            "ix_books_browse",
+            text("created_at DESC"),
+            text("id DESC"),
+            postgresql_where=text("NOT is_sold"),
+            sqlite_where=text("NOT is_sold"),
+        ),
+        # The per-column pg_trgm GIN indexes (ix_books_*_trgm) are created by
+        # migration only.
     )
 
     id: Optional[int] = Field(sa_column=Column(Integer, primary_key=True, default=None, nullable=True))
-    created_at: datetime = Field(
-        default_factory=_utc_now,
+    created_at: Optional[datetime] = Field(
+        default=None,
         sa_column=Column(DateTime(timezone=True), server_default=func.now(), nullable=False),
     )
 
     title: str = Field(..., min_length=1, max_length=256, sa_column=Column(String(256), nullable=False), description="Book title")
     author: Optional[str] = Field(None, max_length=256, sa_column=Column(String(256), nullable=True), description="Book author")
-    # Use Decimal for price; validation handled in field_validator below
-    price: Decimal = Field(..., sa_column=Column(Numeric(10, 2), nullable=False), description="Price in your currency")
+    # Stored as integer cents; use the ``price`` property for a Decimal.
+    price_cents: int = Field(..., sa_column=Column(BigInteger, nullable=False), description="Price in cents of your currency")
     condition: BookCondition = Field(..., sa_column=Column(SAEnum(BookCondition, name="book_condition")), description="Book physical condition")
     description: Optional[str] = Field(None, max_length=2000, sa_column=Column(String(2000), nullable=True), description="Optional book description")
     # Flags & meta
@@ -100,12 +122,26 @@ class Book(SQLModel, table=True):
         nullable=False, foreign_key='users.id',
         description="FK to users.id",
     )
-    seller: Mapped[Optional["User"]] = Relationship(back_populates="books")
+    # Never lazy-load the seller (that would be one query per book, and fails
+    # under asyncio anyway); callers must opt in with selectinload(Book.seller).
+    seller: Mapped[Optional["User"]] = Relationship(
+        back_populates="books",
+        sa_relationship_kwargs={"lazy": "raise_on_sql"},
+    )
 
     # Example: store extra metadata if needed (e.g., tags) using JSON column (optional)
     extra_metadata: Optional[dict] = Field(default=None, sa_column=Column(JSON), description="Optional free-form metadata")
 
     # --- Domain / convenience methods ---
+    @property
+    def price(self) -> Decimal:
+        """Price in currency units, e.g. ``Decimal("12.50")``."""
+        return Decimal(self.price_cents).scaleb(-2)
+
+    @price.setter
+    def price(self, value: Decimal | str | int | float) -> None:
+        self.price_cents = price_to_cents(value)
+
     def mark_sold(self) -> None:
         """Mark the book as sold (in-memory). Commit handled by caller via session."""
         self.is_sold = True
@@ -116,7 +152,7 @@ class Book(SQLModel, table=True):
             "id": self.id,
             "title": self.title,
             "author": self.author,
-            "price": str(self.price) if self.price is not None else None,
+            "price": str(self.price) if self.price_cents is not None else None,
             "condition": self.condition.value if isinstance(self.condition, BookCondition) else str(self.condition),
             "is_sold": self.is_sold,
             "created_at": self.created_at.isoformat() if self.created_at else None,
@@ -128,20 +164,6 @@ class Book(SQLModel, table=True):
             "metadata": self.extra_metadata,
         }
 
-    # Pydantic validators: ensure price uses Decimal quantization (2 decimal places)
-    @field_validator("price", mode="before")
-    @classmethod
-    def quantize_price(cls, v):
-        if v is None:
-            return v
-        if not isinstance(v, Decimal):
-            v = Decimal(str(v))
-        # quantize to 2 decimal places
-        quantized = v.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-        if quantized < Decimal("0"):
-            raise ValueError("price must be non-negative")
-        return quantized
-
     @field_validator("title", "author", "description", mode="before")
     @classmethod
     def strip_and_validate_strings(cls, v):
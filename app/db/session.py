@@ -3,10 +3,11 @@ from __future__ import annotations
 
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
-from typing import Optional
+from typing import Any, Optional
 
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlmodel import SQLModel
 
 from app.config import get_settings
@@ -14,25 +15,48 @@ from app.config import get_settings
 settings = get_settings()
 
 
-def _normalize_database_url(raw_url: str) -> str:
-    """Ensure the database URL is async-driver compatible.
+# Normalized to an async driver by Settings.
+DATABASE_URL = settings.DATABASE_URL
+
+def _should_echo(log_level: str) -> bool:
+    return log_level.upper() == "DEBUG"
 
-    The settings may provide plain ``postgresql://`` URLs which we upgrade to
-    ``postgresql+asyncpg://`` for SQLAlchemy's async engine.
-    """
 
-    if raw_url.startswith("postgresql://") and "+" not in raw_url.split(":", 1)[0]:
-        return raw_url.replace("postgresql://", "postgresql+asyncpg://", 1)
-    if raw_url.startswith("sqlite://") and "+" not in raw_url.split(":", 1)[0]:
-        # default to sqlite+aiosqlite for async operation
-        return raw_url.replace("sqlite://", "sqlite+aiosqlite://", 1)
-    return raw_url
+def _pool_options(url: str) -> dict[str, Any]:
+    """Return connection pool sizing for the given database URL.
 
+    SQLite drivers pick their own pool class (``StaticPool`` for in-memory
+    databases) which rejects sizing arguments, so tuning only applies to
+    server databases such as PostgreSQL.
+    """
 
-DATABASE_URL = _normalize_database_url(settings.DATABASE_URL)
+    if url.startswith("sqlite"):
+        return {}
+    return {
+        # Explicit, so a driver or SQLAlchemy default can never silently
+        # switch the bot to NullPool (a new connection per session).
+        "poolclass": AsyncAdaptedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
+
+def _connect_args(url: str) -> dict[str, Any]:
+    """Return driver connect arguments for the given database URL.
+
+    asyncpg keeps two per-connection caches: SQLAlchemy's prepared statement
+    cache and asyncpg's own statement cache. Sizing both lets frequently run
+    queries skip the parse/plan step on pooled connections.
+    """
 
-def _should_echo(log_level: str) -> bool:
-    return log_level.upper() == "DEBUG"
+    if not url.startswith("postgresql+asyncpg"):
+        return {}
+    return {
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    }
 
 
 def create_engine(echo: Optional[bool] = None) -> AsyncEngine:
@@ -48,6 +72,11 @@ def create_engine(echo: Optional[bool] = None) -> AsyncEngine:
         echo=_should_echo(settings.LOG_LEVEL) if echo is None else echo,
         future=True,
         pool_pre_ping=True,
+        # Every handler/query shape variant gets its own entry; the default
+        # of 500 is easily outgrown once dialect and filter variants add up.
+        query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+        connect_args=_connect_args(DATABASE_URL),
+        **_pool_options(DATABASE_URL),
     )
 
 
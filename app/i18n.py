@@ -1,6 +1,7 @@
 """Internationalization support for the bot."""
 import gettext
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 from app.config import get_settings
@@ -10,9 +11,12 @@ settings = get_settings()
 LOCALE_DIR = Path(__file__).parent.parent / "locale"
 
 
+@lru_cache(maxsize=16)
 def get_translator(language: str = "en") -> callable:
     """
     Get a translator function for the specified language.
+
+    Cached per language, so the catalog lookup runs once per process.
     
     Args:
         language: Language code (e.g., 'en', 'fa')
@@ -1,7 +1,38 @@
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
 
 logger = logging.Logger(__name__)
 log_handler = logging.StreamHandler()
 log_handler.setLevel(logging.NOTSET)
 logger.setLevel(logging.NOTSET)
 logger.addHandler(log_handler)
+
+
+def start_queue_logging(level: str) -> QueueListener:
+    """Route all logging through a queue drained by a background thread.
+
+    Handlers only enqueue records, so a log call never blocks the event loop
+    on writing to stderr. Stop the returned listener on exit to flush it.
+    """
+
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    logging.basicConfig(
+        level=getattr(logging, level.upper(), logging.INFO),
+        format=LOG_FORMAT,
+        handlers=[queue_handler],
+        force=True,
+    )
+    logger.removeHandler(log_handler)
+    logger.addHandler(queue_handler)
+
+    logging.getLogger("aiogram").setLevel(logging.INFO)
+    logging.getLogger("aiogram.dispatcher").setLevel(logging.DEBUG if level == "DEBUG" else logging.INFO)
+
+    # Records reach the listener already formatted by QueueHandler.prepare().
+    listener = QueueListener(log_queue, logging.StreamHandler(), respect_handler_level=True)
+    listener.start()
+    return listener
@@ -2,62 +2,76 @@
 from __future__ import annotations
 
 import asyncio
-from decimal import Decimal
 
-from sqlalchemy import select
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from app.config import get_settings
-from db.models import Book, BookCondition, User
-from db.session import session_scope
+from app.db.models import Book, BookCondition, User
+from app.db.session import session_scope
 
 settings = get_settings()
 
+_DIALECT_INSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
 
 async def seed() -> None:
     async with session_scope() as session:
-        existing = await session.execute(select(User).where(User.telegram_id == 123456789))
-        user = existing.scalar_one_or_none()
-        if user is None:
-            user = User(
-                telegram_id=123456789,
-                username="demo_student",
-                display_name="Demo Student",
-            )
-            session.add(user)
-            await session.flush()
+        # One upsert for the demo user; the no-op update makes RETURNING
+        # yield the id whether or not the row already existed.
+        stmt = _DIALECT_INSERTS[session.get_bind().dialect.name](User).values(
+            telegram_id=123456789,
+            username="demo_student",
+            display_name="Demo Student",
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[User.telegram_id],
+            set_={"telegram_id": stmt.excluded.telegram_id},
+        ).returning(User.id)
+        user_id = (await session.execute(stmt)).scalar_one()
 
         demo_books = [
             {
                 "title": "Calculus, 8th Edition",
                 "author": "James Stewart",
-                "price": Decimal("25.00"),
+                "price_cents": 2500,
                 "condition": BookCondition.GOOD,
                 "description": "Light highlighting in chapters 3-5.",
             },
             {
                 "title": "Introduction to Algorithms",
                 "author": "Cormen, Leiserson, Rivest, Stein",
-                "price": Decimal("40.00"),
+                "price_cents": 4000,
                 "condition": BookCondition.LIKE_NEW,
                 "description": "Pristine condition, bought last semester.",
             },
             {
                 "title": "Organic Chemistry",
                 "author": "Paula Y. Bruice",
-                "price": Decimal("30.00"),
+                "price_cents": 3000,
                 "condition": BookCondition.ACCEPTABLE,
                 "description": "Cover wear, all pages intact.",
             },
         ]
 
-        for payload in demo_books:
-            exists = await session.execute(
-                select(Book).where(Book.title == payload["title"], Book.seller_id == user.id)
+        # books has no unique key to upsert against, so skip existing titles
+        # with one lookup and insert the rest in a single statement.
+        existing = set(
+            await session.scalars(
+                select(Book.title).where(
+                    Book.seller_id == user_id,
+                    Book.title.in_([payload["title"] for payload in demo_books]),
+                )
             )
-            if exists.scalar_one_or_none() is not None:
-                continue
-            book = Book(seller_id=user.id, **payload)
-            session.add(book)
+        )
+        rows = [
+            {"seller_id": user_id, **payload}
+            for payload in demo_books
+            if payload["title"] not in existing
+        ]
+        if rows:
+            await session.execute(insert(Book), rows)
 
     print("Seeded demo user and books.")
 
@@ -1,21 +1,33 @@
 """Starlette application exposing health and book listing endpoints."""
 from __future__ import annotations
 
+import asyncio
+import secrets
 from typing import Any
 
-from sqlalchemy import func, select
-from sqlalchemy.orm import selectinload
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update
+from sqlalchemy import bindparam, func, not_, select
+from sqlalchemy.orm import contains_eager
 from starlette.applications import Starlette
 from starlette.requests import Request
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, Response
 from starlette.routing import Route
 
 from app.config import get_settings
-from db.models import Book, BookCondition
-from db.session import session_scope
+from app.db.models import Book, BookCondition
+from app.db.session import session_scope
+from app.logger import logger
 
 settings = get_settings()
 
+# Shorter substrings than one trigram cannot use the ix_books_*_trgm indexes
+# and would scan every listing.
+MIN_FILTER_LENGTH = 3
+
+# Strong references to in-flight webhook updates so they are not garbage collected.
+_update_tasks: set[asyncio.Task] = set()
+
 
 async def healthz(_: Request) -> JSONResponse:
     """Simple health probe."""
@@ -31,12 +43,24 @@ async def list_books(request: Request) -> JSONResponse:
     per_page_raw = int(params.get("per_page", settings.PAGE_SIZE))
     per_page = max(1, min(per_page_raw, 100))
 
-    filters = [Book.is_sold.is_(False)]
-
-    if author := params.get("author"):
-        filters.append(Book.author.ilike(f"%{author.strip()}%"))
-    if title := params.get("title"):
-        filters.append(Book.title.ilike(f"%{title.strip()}%"))
+    # Spelled to match the ix_books_browse partial index predicate.
+    filters = [not_(Book.is_sold)]
+    # Patterns are bound by name so each filter combination compiles once.
+    bind_params: dict[str, Any] = {}
+
+    author = params.get("author", "").strip()
+    title = params.get("title", "").strip()
+    if 0 < len(author) < MIN_FILTER_LENGTH or 0 < len(title) < MIN_FILTER_LENGTH:
+        return JSONResponse(
+            {"detail": f"Author and title filters need at least {MIN_FILTER_LENGTH} characters."},
+            status_code=400,
+        )
+    if author:
+        filters.append(Book.author.ilike(bindparam("author_pattern")))
+        bind_params["author_pattern"] = f"%{author}%"
+    if title:
+        filters.append(Book.title.ilike(bindparam("title_pattern")))
+        bind_params["title_pattern"] = f"%{title}%"
     if condition := params.get("condition"):
         try:
             condition_enum = BookCondition(condition)
@@ -48,18 +72,25 @@ async def list_books(request: Request) -> JSONResponse:
 
     async with session_scope() as session:
         stmt = (
-            select(Book)
-            .options(selectinload(Book.seller))
+            select(Book, func.count().over().label("total"))
+            .join(Book.seller)
+            .options(contains_eager(Book.seller))
             .where(*filters)
-            .order_by(Book.created_at.desc())
+            .order_by(Book.created_at.desc(), Book.id.desc())
             .offset((page - 1) * per_page)
             .limit(per_page)
         )
-        result = await session.execute(stmt)
-        books = list(result.scalars())
-
-        count_stmt = select(func.count()).select_from(select(Book.id).where(*filters).subquery())
-        total = await session.scalar(count_stmt) or 0
+        rows = (await session.execute(stmt, bind_params)).all()
+        books = [row[0] for row in rows]
+
+        if rows:
+            total = rows[0].total
+        elif page == 1:
+            total = 0
+        else:
+            # A page past the end carries no window total; count separately.
+            count_stmt = select(func.count()).select_from(select(Book.id).where(*filters).subquery())
+            total = await session.scalar(count_stmt, bind_params) or 0
 
     data = {
         "items": [book.serialize() for book in books],
@@ -70,6 +101,69 @@ async def list_books(request: Request) -> JSONResponse:
     return JSONResponse(data)
 
 
+async def _process_update(dispatcher: Dispatcher, bot: Bot, update: Update) -> None:
+    try:
+        await dispatcher.feed_update(bot, update)
+    except Exception as e:
+        logger.error(f"Failed to process webhook update {update.update_id}: {e}", exc_info=True)
+
+
+async def telegram_webhook(request: Request) -> Response:
+    """Receive a Telegram update and dispatch it in the background.
+
+    Telegram gets an immediate 200 so each update is handled concurrently
+    instead of waiting for the previous one.
+    """
+
+    # attach_webhook refuses to run without a secret; never accept updates
+    # unauthenticated even if this route is mounted some other way.
+    secret = settings.WEBHOOK_SECRET
+    if not secret or not secrets.compare_digest(
+        request.headers.get("X-Telegram-Bot-Api-Secret-Token", ""), secret
+    ):
+        return JSONResponse({"detail": "Forbidden."}, status_code=403)
+
+    bot: Bot = request.app.state.bot
+    dispatcher: Dispatcher = request.app.state.dispatcher
+    update = Update.model_validate(await request.json(), context={"bot": bot})
+    task = asyncio.create_task(_process_update(dispatcher, bot, update))
+    _update_tasks.add(task)
+    task.add_done_callback(_update_tasks.discard)
+    return Response(status_code=200)
+
+
+def attach_webhook(bot: Bot, dispatcher: Dispatcher) -> None:
+    """Serve Telegram webhook updates for ``bot`` on ``settings.WEBHOOK_PATH``.
+
+    Raises:
+        RuntimeError: if ``WEBHOOK_SECRET`` is not set. Without it anyone who
+            finds the endpoint could post forged updates as any user.
+    """
+
+    if not settings.WEBHOOK_SECRET:
+        raise RuntimeError("WEBHOOK_SECRET must be set to receive Telegram updates by webhook")
+    app.state.bot = bot
+    app.state.dispatcher = dispatcher
+    app.add_route(settings.WEBHOOK_PATH, telegram_webhook, methods=["POST"])
+
+
+async def drain_webhook_updates(timeout: float) -> None:
+    """Wait up to ``timeout`` seconds for in-flight updates, then cancel the rest.
+
+    Call after the web server has stopped accepting requests and before the
+    bot session and database engine are closed.
+    """
+
+    if not _update_tasks:
+        return
+    _, pending = await asyncio.wait(set(_update_tasks), timeout=timeout)
+    for task in pending:
+        task.cancel()
+    if pending:
+        logger.warning(f"Cancelled {len(pending)} webhook update(s) still running at shutdown")
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
 routes = [
     Route("/healthz", healthz, methods=["GET"]),
     Route("/books", list_books, methods=["GET"]),
@@ -2,7 +2,6 @@
 from __future__ import annotations
 
 import asyncio
-import logging
 import signal
 from contextlib import suppress
 
@@ -13,46 +12,54 @@ from app.bot.bot import create_bot, create_dispatcher, on_shutdown, on_startup
 from app.config import get_settings
 from app.db.migration import run_migrations
 from app.i18n import init_translations
-from app.logger import logger
+from app.logger import logger, start_queue_logging
+from app.web.app import app as web_app, attach_webhook, drain_webhook_updates
+
+try:
+    import uvloop
+except ImportError:  # not available on Windows
+    uvloop = None
 
 settings = get_settings()
 
+# How long shutdown waits for in-flight work before cancelling it.
+SHUTDOWN_TIMEOUT_SECONDS = 10.0
+
 
 async def run_bot(dispatcher: Dispatcher) -> None:
     bot = create_bot()
-    await on_startup(bot)
+    await on_startup(bot, dispatcher)
     try:
         if settings.POLLING:
             await dispatcher.start_polling(
                 bot,
                 polling_timeout=settings.BOT_POLLING_INTERVAL,
+                allowed_updates=dispatcher.resolve_used_update_types(),
             )
         else:
+            attach_webhook(bot, dispatcher)
             config = uvicorn.Config(
-                "web.app:app",
+                web_app,
                 host=settings.UVICORN_HOST,
                 port=settings.UVICORN_PORT,
                 log_level=settings.LOG_LEVEL.lower(),
+                # No handlers of its own: uvicorn's records propagate to the
+                # root logger's queue (see start_queue_logging).
+                log_config=None,
                 reload=settings.UVICORN_RELOAD,
-                access_log=True,
+                # One synchronous log call per request; only worth it when debugging.
+                access_log=settings.LOG_LEVEL == "DEBUG",
             )
             server = uvicorn.Server(config)
             web_task = asyncio.create_task(server.serve(), name="uvicorn-server")
             await web_task
     finally:
+        # Updates still being handled need the bot session and the engine.
+        await drain_webhook_updates(timeout=SHUTDOWN_TIMEOUT_SECONDS)
         await on_shutdown(bot)
 
 
 async def main() -> None:
-    logging.basicConfig(
-        level=getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO),
-        format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-    )
-    
-    # Enable aiogram logging
-    logging.getLogger("aiogram").setLevel(logging.INFO)
-    logging.getLogger("aiogram.dispatcher").setLevel(logging.DEBUG if settings.LOG_LEVEL == "DEBUG" else logging.INFO)
-
     # Initialize translations
     init_translations()
 
@@ -105,7 +112,13 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
+    log_listener = start_queue_logging(settings.LOG_LEVEL)
     try:
-        asyncio.run(main())
+        if uvloop is not None:
+            uvloop.run(main())
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         pass
+    finally:
+        log_listener.stop()
@@ -0,0 +1,13 @@
+"""Test suite; run with ``python -m unittest discover -s tests -t .``.
+
+Settings are read from the environment at import time, so placeholders for
+the required ones are set here before any ``app`` module is imported.
+"""
+import os
+import tempfile
+
+os.environ.setdefault("TELEGRAM_TOKEN", "123456:test-token")
+os.environ.setdefault(
+    "DATABASE_URL",
+    f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='bookswap-tests-'), 'app.db')}",
+)
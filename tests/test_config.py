@@ -0,0 +1,44 @@
+"""DATABASE_URL normalization in Settings."""
+import unittest
+
+from app.config import Settings
+
+
+def normalized(url: str) -> str:
+    return Settings(TELEGRAM_TOKEN="123456:test-token", DATABASE_URL=url).DATABASE_URL
+
+
+class DatabaseUrlTestCase(unittest.TestCase):
+    def test_sslmode_becomes_asyncpg_ssl(self) -> None:
+        self.assertEqual(
+            normalized("postgresql://user:pass@db:5432/books?sslmode=require"),
+            "postgresql+asyncpg://user:pass@db:5432/books?ssl=require",
+        )
+
+    def test_postgres_scheme_gets_asyncpg_driver(self) -> None:
+        self.assertEqual(
+            normalized("postgres://user:pass@db/books"),
+            "postgresql+asyncpg://user:pass@db/books",
+        )
+
+    def test_sqlite_gets_aiosqlite_driver(self) -> None:
+        self.assertEqual(normalized("sqlite://"), "sqlite+aiosqlite://")
+        self.assertEqual(normalized("sqlite:///./books.db"), "sqlite+aiosqlite:///./books.db")
+
+    def test_async_driver_urls_are_unchanged(self) -> None:
+        for url in (
+            "postgresql+asyncpg://user:pass@db:5432/books?ssl=require",
+            "sqlite+aiosqlite:///./books.db",
+        ):
+            with self.subTest(url=url):
+                self.assertEqual(normalized(url), url)
+
+    def test_percent_encoded_password_survives(self) -> None:
+        self.assertEqual(
+            normalized("postgresql://user:p%40ss%2Fw0rd@db/books"),
+            "postgresql+asyncpg://user:p%40ss%2Fw0rd@db/books",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
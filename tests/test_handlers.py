@@ -0,0 +1,141 @@
+"""Message routing through the bot dispatcher, with Telegram calls recorded."""
+import itertools
+import unittest
+from datetime import datetime, timezone
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from aiogram import Bot
+from aiogram.client.session.base import BaseSession
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.methods import SendMessage, TelegramMethod
+from aiogram.types import Chat, Message, Update, User
+
+from app.bot.bot import create_dispatcher
+from app.bot.handlers import _RENDERED_PAGES, PostBookStates, show_page
+from app.logger import logger
+
+_ids = itertools.count(1)
+
+
+class RecordingSession(BaseSession):
+    """Bot session that records API calls instead of sending them."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.requests: list[TelegramMethod[Any]] = []
+
+    async def make_request(self, bot: Bot, method: TelegramMethod[Any], timeout: int | None = None) -> Any:
+        self.requests.append(method)
+        return None
+
+    async def stream_content(self, *args: Any, **kwargs: Any):  # pragma: no cover - unused
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class HandlerTestCase(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        # The handlers router can only be attached to one dispatcher.
+        cls.dispatcher = create_dispatcher()
+
+    async def asyncSetUp(self) -> None:
+        self.session = RecordingSession()
+        self.bot = Bot(token="123456:test-token", session=self.session)
+        # Each test gets its own chat so per-chat throttling never carries over.
+        self.chat_id = next(_ids)
+
+    def state(self):
+        return self.dispatcher.fsm.get_context(self.bot, chat_id=self.chat_id, user_id=self.chat_id)
+
+    async def send(self, text: str) -> None:
+        message = Message(
+            message_id=next(_ids),
+            date=datetime.now(timezone.utc),
+            chat=Chat(id=self.chat_id, type="private"),
+            from_user=User(id=self.chat_id, is_bot=False, first_name="Reader"),
+            text=text,
+        )
+        await self.dispatcher.feed_update(self.bot, Update(update_id=next(_ids), message=message))
+
+    def replies(self) -> list[str]:
+        return [request.text for request in self.session.requests if isinstance(request, SendMessage)]
+
+    async def test_menu_word_is_taken_as_title_during_post_flow(self) -> None:
+        state = self.state()
+        await state.set_state(PostBookStates.title)
+
+        await self.send("browse")
+
+        self.assertEqual(await state.get_state(), PostBookStates.author.state)
+        self.assertEqual((await state.get_data())["title"], "browse")
+        self.assertEqual(len(self.replies()), 1)
+
+    async def test_quick_answers_in_post_flow_are_not_throttled(self) -> None:
+        state = self.state()
+        await state.set_state(PostBookStates.title)
+
+        await self.send("Dune")
+        await self.send("Frank Herbert")
+
+        self.assertEqual(await state.get_state(), PostBookStates.condition.state)
+        self.assertEqual(len(self.replies()), 2)
+
+    async def test_command_right_after_a_message_is_not_throttled(self) -> None:
+        await self.send("hello")
+        await self.send("/cancel")
+
+        self.assertEqual(len(self.replies()), 1)
+
+    async def test_handler_error_is_logged_once_with_handler_name(self) -> None:
+        with patch("app.bot.handlers.render_browse_page", side_effect=RuntimeError("boom")):
+            with self.assertLogs(logger, level="ERROR") as logs:
+                await self.send("/browse")
+
+        self.assertEqual(len(logs.records), 1)
+        exception = logs.records[0].exc_info[1]
+        self.assertIn("Raised in handler dispatch_text_command", exception.__notes__)
+
+
+class ShowPageTestCase(unittest.IsolatedAsyncioTestCase):
+    def callback_query(self, *, message_id: int) -> MagicMock:
+        query = MagicMock()
+        query.message.chat.id = 7
+        query.message.message_id = message_id
+        query.message.edit_text = AsyncMock()
+        query.message.answer = AsyncMock(return_value=MagicMock(chat=MagicMock(id=7), message_id=message_id + 1))
+        return query
+
+    async def test_fallback_records_page_under_new_message(self) -> None:
+        query = self.callback_query(message_id=100)
+        _RENDERED_PAGES[(7, 100)] = hash("old page")
+        query.message.edit_text.side_effect = TelegramBadRequest(
+            method=SendMessage(chat_id=7, text="page"), message="Bad Request: message can't be edited"
+        )
+
+        await show_page(query, "page", None)
+
+        query.message.answer.assert_awaited_once()
+        self.assertNotIn((7, 100), _RENDERED_PAGES)
+        self.assertEqual(_RENDERED_PAGES[(7, 101)], hash("page"))
+
+        # The new message now shows the page, so re-rendering it is skipped.
+        follow_up = self.callback_query(message_id=101)
+        await show_page(follow_up, "page", None)
+        follow_up.message.edit_text.assert_not_awaited()
+
+    async def test_failed_edit_records_nothing(self) -> None:
+        query = self.callback_query(message_id=200)
+        query.message.edit_text.side_effect = RuntimeError("network down")
+
+        with self.assertRaises(RuntimeError):
+            await show_page(query, "page", None)
+
+        self.assertNotIn((7, 200), _RENDERED_PAGES)
+
+
+if __name__ == "__main__":
+    unittest.main()
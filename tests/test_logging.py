@@ -0,0 +1,39 @@
+"""Queue logging set up by ``start_queue_logging``."""
+import asyncio
+import logging
+import unittest
+from logging.handlers import QueueHandler
+
+from app.db.migration import run_migrations
+from app.logger import start_queue_logging
+
+
+class QueueLoggingTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        root = logging.getLogger()
+        saved_handlers, saved_level = root.handlers[:], root.level
+        aiogram_logger = logging.getLogger("aiogram")
+        saved_aiogram_level = aiogram_logger.level
+
+        def restore() -> None:
+            root.handlers[:] = saved_handlers
+            root.setLevel(saved_level)
+            aiogram_logger.setLevel(saved_aiogram_level)
+            aiogram_logger.disabled = False
+
+        self.addCleanup(restore)
+
+    def test_migrations_keep_queue_handlers(self) -> None:
+        listener = start_queue_logging("INFO")
+        self.addCleanup(listener.stop)
+
+        asyncio.run(run_migrations())
+
+        root = logging.getLogger()
+        self.assertEqual([type(handler) for handler in root.handlers], [QueueHandler])
+        self.assertEqual(root.level, logging.INFO)
+        self.assertFalse(logging.getLogger("aiogram").disabled)
+
+
+if __name__ == "__main__":
+    unittest.main()
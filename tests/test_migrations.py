@@ -0,0 +1,48 @@
+"""Alembic migrations run against a throwaway SQLite database."""
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from alembic import command
+from alembic.config import Config
+
+from app.db.migration import _CONF_PATH
+
+
+class MigrationTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.db_path = os.path.join(tmp.name, "migrations.db")
+        self.config = Config(str(_CONF_PATH))
+        self.config.set_main_option("sqlalchemy.url", f"sqlite+aiosqlite:///{self.db_path}")
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.db_path)
+        self.addCleanup(connection.close)
+        return connection
+
+    def test_price_cents_keeps_prices_above_32_bit_range(self) -> None:
+        # Last revision with the Numeric(10, 2) price column.
+        command.upgrade(self.config, "5d81c4e7a2b9")
+        with self._connect() as connection:
+            connection.execute("INSERT INTO users (id, telegram_id) VALUES (1, 42)")
+            connection.execute(
+                "INSERT INTO books (id, title, price, condition, is_sold, seller_id) "
+                "VALUES (1, 'Atlas', 99999999.99, 'GOOD', 0, 1)"
+            )
+
+        command.upgrade(self.config, "head")
+
+        with self._connect() as connection:
+            price_cents = connection.execute("SELECT price_cents FROM books WHERE id = 1").fetchone()[0]
+            column_types = {row[1]: row[2] for row in connection.execute("PRAGMA table_info(books)")}
+        self.assertEqual(price_cents, 9_999_999_999)
+        # SQLite stores any integer in 64 bits; the declared type is what
+        # PostgreSQL would enforce.
+        self.assertEqual(column_types["price_cents"], "BIGINT")
+
+
+if __name__ == "__main__":
+    unittest.main()
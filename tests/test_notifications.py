@@ -0,0 +1,28 @@
+"""Seller notification worker lifecycle."""
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.bot import notifications
+
+
+class NotifyWorkerTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_stop_flushes_queued_notifications_and_refuses_new_ones(self) -> None:
+        bot = MagicMock()
+        bot.send_message = AsyncMock()
+        notifications.start_notify_worker(bot)
+        await notifications.enqueue_notification(5, "first")
+        await notifications.enqueue_notification(5, "second")
+        # Let the worker pick up the batch and start its coalesce wait.
+        await asyncio.sleep(0)
+
+        # Well under COALESCE_WINDOW_SECONDS: stopping must not wait it out.
+        await asyncio.wait_for(notifications.stop_notify_worker(), timeout=1)
+        await notifications.enqueue_notification(5, "too late")
+
+        bot.send_message.assert_awaited_once_with(chat_id=5, text="first\n\nsecond")
+        self.assertTrue(notifications._queue.empty())
+
+
+if __name__ == "__main__":
+    unittest.main()
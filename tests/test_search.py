@@ -0,0 +1,58 @@
+"""search_books against a throwaway SQLite database."""
+import os
+import tempfile
+import unittest
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlmodel import SQLModel
+
+from app.bot.utils import create_book, search_books
+from app.db.models import BookCondition, User
+
+
+class SearchBooksTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tmp.name, 'search.db')}")
+        self.addAsyncCleanup(engine.dispose)
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+
+        self.session = AsyncSession(engine, expire_on_commit=False)
+        self.addAsyncCleanup(self.session.close)
+        seller = User(telegram_id=1, username="seller")
+        self.session.add(seller)
+        await self.session.flush()
+        for title, description in [
+            ("Dune", None),
+            ("Fondue Basics", None),
+            ("Cooking", "Includes a dumpling chapter"),
+            ("100% Cotton", None),
+            ("1000 Recipes", None),
+            ("abc", None),
+        ]:
+            await create_book(
+                self.session,
+                seller_id=seller.id,
+                title=title,
+                author=None,
+                price_cents=100,
+                condition=BookCondition.GOOD,
+                description=description,
+            )
+
+    async def titles(self, query: str) -> set[str]:
+        books, _, _ = await search_books(self.session, query=query, page=1, per_page=20)
+        return {book.title for book in books}
+
+    async def test_short_terms_match_substrings_in_all_columns(self) -> None:
+        self.assertEqual(await self.titles("du"), {"Dune", "Fondue Basics", "Cooking"})
+
+    async def test_like_wildcards_in_query_are_literal(self) -> None:
+        self.assertEqual(await self.titles("100%"), {"100% Cotton"})
+        self.assertEqual(await self.titles("a_c"), set())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+"""Telegram webhook endpoint and shutdown of in-flight updates."""
+import asyncio
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+
+from starlette.requests import Request
+
+from app.config import get_settings
+from app.web import app as web
+
+
+def webhook_request(body: dict, secret: str | None = None) -> Request:
+    headers = [(b"content-type", b"application/json")]
+    if secret is not None:
+        headers.append((b"x-telegram-bot-api-secret-token", secret.encode()))
+    payload = json.dumps(body).encode()
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": payload, "more_body": False}
+
+    scope = {"type": "http", "method": "POST", "path": "/webhook", "headers": headers, "app": web.app}
+    return Request(scope, receive)
+
+
+class WebhookTestCase(unittest.IsolatedAsyncioTestCase):
+    def with_secret(self, secret: str | None):
+        return patch.object(web, "settings", get_settings().model_copy(update={"WEBHOOK_SECRET": secret}))
+
+    def test_attach_requires_secret(self) -> None:
+        with self.with_secret(None), self.assertRaises(RuntimeError):
+            web.attach_webhook(MagicMock(), MagicMock())
+
+    async def test_update_without_configured_secret_is_rejected(self) -> None:
+        with self.with_secret(None):
+            response = await web.telegram_webhook(webhook_request({"update_id": 1}, secret=""))
+        self.assertEqual(response.status_code, 403)
+
+    async def test_update_with_wrong_secret_is_rejected(self) -> None:
+        with self.with_secret("s3cret"):
+            response = await web.telegram_webhook(webhook_request({"update_id": 1}, secret="guess"))
+        self.assertEqual(response.status_code, 403)
+
+    async def test_drain_waits_then_cancels_stragglers(self) -> None:
+        finished = asyncio.create_task(asyncio.sleep(0.01))
+        stuck = asyncio.create_task(asyncio.sleep(60))
+        web._update_tasks.update({finished, stuck})
+        self.addCleanup(web._update_tasks.difference_update, {finished, stuck})
+
+        await web.drain_webhook_updates(timeout=0.1)
+
+        self.assertTrue(finished.done() and not finished.cancelled())
+        self.assertTrue(stuck.cancelled())
+
+
+if __name__ == "__main__":
+    unittest.main()